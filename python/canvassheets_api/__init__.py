@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import base64
 import datetime
+import heapq
 import math
+import operator
 import re
+import struct
 from contextlib import contextmanager
 from dataclasses import dataclass, field
-from pprint import pformat
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache, partial
+from itertools import chain
+from pprint import PrettyPrinter
+from string import ascii_uppercase
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
@@ -15,10 +22,25 @@ class RangeParserError(ValueError):
     pass
 
 
+_COLUMN_LABELS: Tuple[str, ...] = tuple(ascii_uppercase) + tuple(
+    first + second for first in ascii_uppercase for second in ascii_uppercase
+)
+_COLUMN_INDEXES: Dict[str, int] = {label: index for index, label in enumerate(_COLUMN_LABELS)}
+
+
 def column_index(label: str) -> int:
     upper = label.strip().upper()
+    index = _COLUMN_INDEXES.get(upper)
+    if index is not None:
+        return index
     if not upper:
         raise RangeParserError("Invalid column label")
+    if len(upper) <= 4 and upper.isascii() and upper.isalpha():
+        code = upper.encode("ascii")
+        if len(code) == 3:
+            return (code[0] - 64) * 676 + (code[1] - 64) * 26 + code[2] - 65
+        if len(code) == 4:
+            return (code[0] - 64) * 17576 + (code[1] - 64) * 676 + (code[2] - 64) * 26 + code[3] - 65
     value = 0
     for ch in upper:
         if ch < "A" or ch > "Z":
@@ -30,6 +52,8 @@ def column_index(label: str) -> int:
 def column_label(index: int) -> str:
     if index < 0:
         raise RangeParserError("Column index must be non-negative")
+    if index < len(_COLUMN_LABELS):
+        return _COLUMN_LABELS[index]
     number = index + 1
     chars: List[str] = []
     while number > 0:
@@ -39,36 +63,44 @@ def column_label(index: int) -> str:
     return "".join(reversed(chars))
 
 
+_CELL_LABEL_RE = re.compile(r"([A-Za-z]+)(\d+)")
+
+
+@lru_cache(maxsize=65536)
 def parse_cell(cell: str) -> Tuple[int, int]:
-    trimmed = cell.strip()
-    if not trimmed:
-        raise RangeParserError("Invalid cell reference")
-    letters = ""
-    numbers = ""
-    for ch in trimmed:
-        if ch.isalpha() and not numbers:
-            letters += ch
-        else:
-            numbers += ch
-    if not letters or not numbers:
+    match = _CELL_LABEL_RE.fullmatch(cell.strip())
+    if match is None:
         raise RangeParserError("Invalid cell reference")
-    if not numbers.isdigit():
-        raise RangeParserError("Invalid cell reference")
-    row_number = int(numbers)
-    if row_number < 0:
-        raise RangeParserError("Invalid cell reference")
-    col_index = column_index(letters)
-    return row_number, col_index
+    letters, numbers = match.groups()
+    return int(numbers), column_index(letters)
 
 
 def cell_label(row: int, col: int) -> str:
     return f"{column_label(col)}{row}"
 
 
+@lru_cache(maxsize=65536)
 def address(region: str, row: int, col: int) -> str:
     return f"{region}[{cell_label(row, col)}]"
 
 
+def _address_block(region: str, row_start: int, row_end: int,
+                   col_start: int, col_end: int) -> Tuple[Tuple[str, ...], ...]:
+    if (row_end - row_start + 1) * (col_end - col_start + 1) <= _ADDRESS_BLOCK_LIMIT:
+        return _cached_address_block(region, row_start, row_end, col_start, col_end)
+    return _build_address_block(region, row_start, row_end, col_start, col_end)
+
+
+def _build_address_block(region: str, row_start: int, row_end: int,
+                         col_start: int, col_end: int) -> Tuple[Tuple[str, ...], ...]:
+    prefixes = [f"{region}[{column_label(col)}" for col in range(col_start, col_end + 1)]
+    return tuple(tuple([prefix + suffix for prefix in prefixes])
+                 for suffix in [f"{row}]" for row in range(row_start, row_end + 1)])
+
+
+_cached_address_block = lru_cache(maxsize=256)(_build_address_block)
+
+
 def _normalize_table_index(key: Any) -> Tuple[int, int]:
     if not isinstance(key, tuple) or len(key) != 2:
         raise TypeError("Table index must be a (row, col) tuple")
@@ -80,6 +112,7 @@ def _normalize_table_index(key: Any) -> Tuple[int, int]:
     return row, col
 
 
+@lru_cache(maxsize=65536)
 def parse_range(range_str: str) -> Tuple[str, int, int, int, int]:
     trimmed = range_str.strip()
     if "[" not in trimmed or not trimmed.endswith("]"):
@@ -107,23 +140,15 @@ def _range_bounds(range_ref: Tuple[str, int, int, int, int]) -> Tuple[str, int,
     return region, row_start, row_end, col_start, col_end
 
 
-def _ranges_intersect(lhs: Tuple[str, int, int, int, int],
-                      rhs: Tuple[str, int, int, int, int]) -> bool:
-    lhs_region, lhs_row_start, lhs_row_end, lhs_col_start, lhs_col_end = _range_bounds(lhs)
-    rhs_region, rhs_row_start, rhs_row_end, rhs_col_start, rhs_col_end = _range_bounds(rhs)
-    if lhs_region != rhs_region:
-        return False
-    row_overlap = lhs_row_start <= rhs_row_end and lhs_row_end >= rhs_row_start
-    col_overlap = lhs_col_start <= rhs_col_end and lhs_col_end >= rhs_col_start
-    return row_overlap and col_overlap
-
-
 def _rectangularize_values(values: List[List[Any]], fill: Any = None) -> List[List[Any]]:
     if not values:
         return values
-    width = max((len(row) for row in values), default=0)
+    lengths = list(map(len, values))
+    width = max(lengths, default=0)
     if width <= 0:
         return []
+    if min(lengths) == width:
+        return list(map(list, values))
     result: List[List[Any]] = []
     for row in values:
         if len(row) < width:
@@ -137,6 +162,9 @@ class FormulaError(ValueError):
     pass
 
 
+_UNSAFE_IDENTIFIER_RE = re.compile(r"[^A-Za-z0-9_]")
+_PRETTY_WIDTH = 88
+_PRETTY_PRINTER = PrettyPrinter(width=_PRETTY_WIDTH)
 _FORMULA_CELL_RE = re.compile(r"^[A-Za-z]+[0-9]+$")
 _active_formula_table: Optional["Table"] = None
 _active_label_context: Optional[Tuple["Table", str]] = None
@@ -148,6 +176,19 @@ _DEFAULT_TABLE_OFFSET = 24.0
 _DEFAULT_TABLE_ORIGIN = 80.0
 _DEFAULT_CHART_WIDTH = 360.0
 _DEFAULT_CHART_HEIGHT = 240.0
+_BASE64_ARRAY_THRESHOLD = 256
+_GRID_CELL_LIMIT = 1 << 22
+_ADDRESS_BLOCK_LIMIT = 1 << 16
+_CHANGE_LOG_LIMIT = 1 << 16
+_NUMERIC_ARRAY_THRESHOLD = 64
+_NUMERIC_SHADOWS = hasattr(np, "__version__")
+_NUMERIC_EMPTY = 0
+_NUMERIC_NUMBER = 1
+_NUMERIC_TEXT = 2
+_NUMERIC_OTHER = 3
+_NUMERIC_CELL_TYPES = frozenset((bool, int, float, str))
+_ORDER_BUCKET_ROWS = 64
+_ORDER_BUCKET_SPAN = 64
 _UNSET = object()
 
 
@@ -159,49 +200,84 @@ def _next_formula_order() -> int:
 
 class FormulaExpr:
     def __init__(self, expr: str) -> None:
-        self.expr = expr
+        self._parts: Tuple[Any, ...] = (expr,)
+        self._expr: Optional[str] = expr
+
+    @classmethod
+    def _join(cls, *parts: Any) -> "FormulaExpr":
+        joined = FormulaExpr.__new__(FormulaExpr)
+        joined._parts = tuple(part if isinstance(part, str) else part._expr if part._expr is not None else part._parts
+                              for part in parts)
+        joined._expr = None
+        return joined
+
+    @property
+    def expr(self) -> str:
+        if self._expr is None:
+            pieces: List[str] = []
+            pending = list(reversed(self._parts))
+            while pending:
+                part = pending.pop()
+                if isinstance(part, str):
+                    pieces.append(part)
+                else:
+                    pending.extend(reversed(part))
+            self._expr = "".join(pieces)
+        return self._expr
+
+    @expr.setter
+    def expr(self, value: str) -> None:
+        self._parts = (value,)
+        self._expr = value
 
     def __add__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{self.expr}+{_formula_literal(other)}")
+        return FormulaExpr._join(self, "+", _formula_part(other))
 
     def __radd__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{_formula_literal(other)}+{self.expr}")
+        return FormulaExpr._join(_formula_part(other), "+", self)
 
     def __sub__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{self.expr}-{_formula_literal(other)}")
+        return FormulaExpr._join(self, "-", _formula_part(other))
 
     def __rsub__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{_formula_literal(other)}-{self.expr}")
+        return FormulaExpr._join(_formula_part(other), "-", self)
 
     def __mul__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{self.expr}*{_formula_literal(other)}")
+        return FormulaExpr._join(self, "*", _formula_part(other))
 
     def __rmul__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{_formula_literal(other)}*{self.expr}")
+        return FormulaExpr._join(_formula_part(other), "*", self)
 
     def __truediv__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{self.expr}/{_formula_literal(other)}")
+        return FormulaExpr._join(self, "/", _formula_part(other))
 
     def __rtruediv__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{_formula_literal(other)}/{self.expr}")
+        return FormulaExpr._join(_formula_part(other), "/", self)
 
     def __pow__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{self.expr}^{_formula_literal(other)}")
+        return FormulaExpr._join(self, "^", _formula_part(other))
 
     def __rpow__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{_formula_literal(other)}^{self.expr}")
+        return FormulaExpr._join(_formula_part(other), "^", self)
 
     def __xor__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{self.expr}^{_formula_literal(other)}")
+        return FormulaExpr._join(self, "^", _formula_part(other))
 
     def __rxor__(self, other: Any) -> "FormulaExpr":
-        return FormulaExpr(f"{_formula_literal(other)}^{self.expr}")
+        return FormulaExpr._join(_formula_part(other), "^", self)
 
     def __neg__(self) -> "FormulaExpr":
-        return FormulaExpr(f"-{self.expr}")
+        return FormulaExpr._join("-", self)
 
     def __pos__(self) -> "FormulaExpr":
-        return FormulaExpr(f"+{self.expr}")
+        return FormulaExpr._join("+", self)
+
+
+@lru_cache(maxsize=8192)
+def _formula_attribute_expr(prefix: str, opener: str, name: str, closer: str) -> Optional[str]:
+    if not _FORMULA_CELL_RE.match(name):
+        return None
+    return f"{prefix}{opener}{name.upper()}{closer}"
 
 
 class FormulaCell(FormulaExpr):
@@ -222,6 +298,12 @@ def _formula_literal(value: Any) -> str:
     raise FormulaError("Unsupported literal in formula expression")
 
 
+def _formula_part(value: Any) -> Any:
+    if isinstance(value, FormulaExpr):
+        return value
+    return _formula_literal(value)
+
+
 def _formula_arg(value: Any) -> str:
     if isinstance(value, FormulaExpr):
         return value.expr
@@ -412,9 +494,10 @@ class LabelRegionProxy:
         object.__setattr__(self, "_region", region)
 
     def __getattr__(self, name: str) -> Any:
-        if _FORMULA_CELL_RE.match(name):
-            cell_ref = name.upper()
-            return FormulaExpr(f"{self._region}[{cell_ref}]")
+        if name[:1] != "_":
+            expr = _formula_attribute_expr(self._region, "[", name, "]")
+            if expr is not None:
+                return FormulaExpr(expr)
         raise AttributeError(name)
 
     def __setattr__(self, name: str, value: Any) -> None:
@@ -431,199 +514,168 @@ class LabelRegionProxy:
 
 
 class FormulaLocals(dict):
-    def __missing__(self, key: str) -> Any:
-        if _active_formula_table is not None and _FORMULA_CELL_RE.match(key):
-            cell_ref = key.upper()
-            value = FormulaCell(cell_ref)
-            self[key] = value
-            return value
-        if _active_formula_table is not None and key in _LABEL_REGIONS:
-            proxy = LabelRegionProxy(_active_formula_table, key)
-            self[key] = proxy
-            return proxy
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._bind_builtins()
+
+    def _bind_builtins(self) -> None:
         builtins_obj = self.get("__builtins__", __builtins__)
         if isinstance(builtins_obj, dict):
-            if key in builtins_obj:
-                return builtins_obj[key]
+            self._builtins_lookup = builtins_obj.__getitem__
+            names = builtins_obj
         else:
-            if hasattr(builtins_obj, key):
-                return getattr(builtins_obj, key)
-        raise KeyError(key)
-
-    def __setitem__(self, key: str, value: Any) -> None:
-        if _active_formula_table is not None and _FORMULA_CELL_RE.match(key):
-            cell_ref = key.upper()
-            if isinstance(value, FormulaExpr):
-                _active_formula_table.set_formula(f"body[{cell_ref}]", f"={value.expr}")
-                return super().__setitem__(key, FormulaCell(cell_ref))
-            _active_formula_table.set_cells({f"body[{cell_ref}]": value})
-            return super().__setitem__(key, FormulaCell(cell_ref))
-        if _active_label_context is not None and _FORMULA_CELL_RE.match(key):
-            table, region = _active_label_context
+            self._builtins_lookup = partial(getattr, builtins_obj)
+            names = vars(builtins_obj)
+        for key, value in getattr(self, "_seeded", {}).items():
+            if dict.get(self, key, _UNSET) is value:
+                dict.__delitem__(self, key)
+        seeded = {key: value for key, value in names.items()
+                  if key[:1] != "_" and not dict.__contains__(self, key)}
+        dict.update(self, seeded)
+        self._seeded = seeded
+
+    def __missing__(self, key: str, _cell_match: Callable[[str], Any] = _FORMULA_CELL_RE.match) -> Any:
+        formula_table = _active_formula_table
+        if formula_table is not None:
+            if _cell_match(key):
+                value = FormulaCell(key.upper())
+                self[key] = value
+                return value
+            if key in _LABEL_REGIONS:
+                proxy = LabelRegionProxy(formula_table, key)
+                self[key] = proxy
+                return proxy
+        try:
+            return self._builtins_lookup(key)
+        except (KeyError, AttributeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any, _cell_match: Callable[[str], Any] = _FORMULA_CELL_RE.match,
+                    _set: Callable[[dict, Any, Any], None] = dict.__setitem__) -> None:
+        formula_table = _active_formula_table
+        label_context = _active_label_context
+        if (formula_table is not None or label_context is not None) and _cell_match(key):
             cell_ref = key.upper()
+            if formula_table is not None:
+                table, region = formula_table, "body"
+            else:
+                table, region = label_context
             if isinstance(value, FormulaExpr):
                 table.set_formula(f"{region}[{cell_ref}]", f"={value.expr}")
-                return super().__setitem__(key, FormulaCell(cell_ref))
-            table.set_cells({f"{region}[{cell_ref}]": value})
-            return super().__setitem__(key, FormulaCell(cell_ref))
-        return super().__setitem__(key, value)
+            else:
+                table.set_cells({f"{region}[{cell_ref}]": value})
+            return _set(self, key, FormulaCell(cell_ref))
+        _set(self, key, value)
+        if key == "__builtins__":
+            self._bind_builtins()
 
 
-@dataclass(frozen=True)
-class Token:
+class Token(NamedTuple):
     type: str
     value: str
     pos: int
 
 
-_CELL_TOKEN_RE = re.compile(r"\$?[A-Za-z]+\$?\d+")
-_NUMBER_TOKEN_RE = re.compile(r"(?:\d+\.\d*|\d+|\.\d+)")
-_IDENT_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_\.\$]*")
 _CELL_REF_RE = re.compile(r"(\$?)([A-Za-z]+)(\$?)(\d+)")
 
 
+_FORMULA_TOKEN_RE = re.compile(
+    r"""(?P<SPACE>\s+)
+    |(?P<STRING>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    |(?P<UNTERMINATED>["'])
+    |(?P<CMP><=|>=|<>|[<>=])
+    |(?P<OP>[+\-*/^])
+    |(?P<PUNCT>[(),:\[\]])
+    |(?P<FUNC>\$?[A-Za-z]+\$?\d+(?=\s*\())
+    |(?P<CELL>\$?[A-Za-z]+\$?\d+)
+    |(?P<NUMBER>\d+\.\d*|\d+|\.\d+)
+    |(?P<TABLEREF>[A-Za-z_][A-Za-z0-9_\$]*\.[A-Za-z0-9_\.\$]*(?![A-Za-z0-9_\.\$]|\s*\())
+    |(?P<IDENT>[A-Za-z_][A-Za-z0-9_\.\$]*)
+    |(?P<MISMATCH>.)""",
+    re.VERBOSE | re.DOTALL,
+)
+_STRING_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+
+
 def _tokenize_formula(text: str) -> List[Token]:
     tokens: List[Token] = []
-    index = 0
-    length = len(text)
-
-    def next_non_space(pos: int) -> str:
-        while pos < length and text[pos].isspace():
-            pos += 1
-        return text[pos] if pos < length else ""
-
-    while index < length:
-        ch = text[index]
-        if ch.isspace():
-            index += 1
-            continue
-        if ch in ('"', "'"):
-            quote = ch
-            start = index
-            index += 1
-            chars: List[str] = []
-            while index < length:
-                current = text[index]
-                if current == "\\":
-                    next_index = index + 1
-                    if next_index >= length:
-                        raise FormulaError("Unterminated string literal")
-                    chars.append(text[next_index])
-                    index += 2
-                    continue
-                if current == quote:
-                    index += 1
-                    break
-                chars.append(current)
-                index += 1
-            else:
-                raise FormulaError("Unterminated string literal")
-            tokens.append(Token("STRING", "".join(chars), start))
-            continue
-        if text.startswith("<=", index) or text.startswith(">=", index) or text.startswith("<>", index):
-            tokens.append(Token("CMP", text[index:index + 2], index))
-            index += 2
-            continue
-        if ch in "<>=":
-            tokens.append(Token("CMP", ch, index))
-            index += 1
-            continue
-        if ch in "+-*/^":
-            tokens.append(Token("OP", ch, index))
-            index += 1
-            continue
-        if ch in "(),:[]":
-            tokens.append(Token(ch, ch, index))
-            index += 1
-            continue
-        match = _CELL_TOKEN_RE.match(text, index)
-        if match:
-            next_char = next_non_space(match.end())
-            token_type = "IDENT" if next_char == "(" else "CELL"
-            tokens.append(Token(token_type, match.group(0), index))
-            index = match.end()
-            continue
-        match = _NUMBER_TOKEN_RE.match(text, index)
-        if match:
-            tokens.append(Token("NUMBER", match.group(0), index))
-            index = match.end()
-            continue
-        match = _IDENT_TOKEN_RE.match(text, index)
-        if match:
-            tokens.append(Token("IDENT", match.group(0), index))
-            index = match.end()
+    for match in _FORMULA_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        index = match.start()
+        if kind == "SPACE":
             continue
-        raise FormulaError(f"Unexpected character '{ch}' at position {index}")
-    tokens.append(Token("EOF", "", index))
+        if kind == "STRING":
+            tokens.append(Token("STRING", _STRING_ESCAPE_RE.sub(r"\1", value[1:-1]), index))
+        elif kind == "PUNCT":
+            tokens.append(Token(value, value, index))
+        elif kind == "FUNC":
+            tokens.append(Token("IDENT", value, index))
+        elif kind == "UNTERMINATED":
+            raise FormulaError("Unterminated string literal")
+        elif kind == "MISMATCH":
+            raise FormulaError(f"Unexpected character '{value}' at position {index}")
+        else:
+            tokens.append(Token(kind, value, index))
+    tokens.append(Token("EOF", "", len(text)))
     return tokens
 
 
-@dataclass(frozen=True)
-class CellRef:
+class CellRef(NamedTuple):
     row: int
     col: int
     row_abs: bool
     col_abs: bool
 
 
-@dataclass(frozen=True)
-class NumberNode:
+class NumberNode(NamedTuple):
     value: float
 
 
-@dataclass(frozen=True)
-class BoolNode:
+class BoolNode(NamedTuple):
     value: bool
 
 
-@dataclass(frozen=True)
-class StringNode:
+class StringNode(NamedTuple):
     value: str
 
 
-@dataclass(frozen=True)
-class UnaryOpNode:
+class UnaryOpNode(NamedTuple):
     op: str
     operand: Any
 
 
-@dataclass(frozen=True)
-class BinaryOpNode:
+class BinaryOpNode(NamedTuple):
     op: str
     left: Any
     right: Any
 
 
-@dataclass(frozen=True)
-class FuncCallNode:
+class FuncCallNode(NamedTuple):
     name: str
-    args: List[Any]
+    args: Tuple[Any, ...]
 
 
-@dataclass(frozen=True)
-class CellRefNode:
+class CellRefNode(NamedTuple):
     table_id: Optional[str]
     region: str
     cell: CellRef
 
 
-@dataclass(frozen=True)
-class RangeRefNode:
+class RangeRefNode(NamedTuple):
     table_id: Optional[str]
     region: str
     start: CellRef
     end: CellRef
 
 
-@dataclass(frozen=True)
-class ColumnRefNode:
+class ColumnRefNode(NamedTuple):
     table_id: Optional[str]
     region: str
     col: int
 
 
-@dataclass(frozen=True)
-class RowRefNode:
+class RowRefNode(NamedTuple):
     table_id: Optional[str]
     region: str
     row: int
@@ -663,74 +715,81 @@ class FormulaParser:
 
     def _parse_comparison(self) -> Any:
         node = self._parse_expression()
-        while self._peek().type == "CMP":
-            op = self._advance().value
-            right = self._parse_expression()
-            node = BinaryOpNode(op=op, left=node, right=right)
+        tokens = self.tokens
+        while tokens[self.index].type == "CMP":
+            op = tokens[self.index].value
+            self.index += 1
+            node = BinaryOpNode(op, node, self._parse_expression())
         return node
 
     def _parse_expression(self) -> Any:
         node = self._parse_term()
-        while self._peek().type == "OP" and self._peek().value in "+-":
-            op = self._advance().value
-            right = self._parse_term()
-            node = BinaryOpNode(op=op, left=node, right=right)
-        return node
+        tokens = self.tokens
+        while True:
+            token = tokens[self.index]
+            if token.type != "OP" or token.value not in "+-":
+                return node
+            self.index += 1
+            node = BinaryOpNode(token.value, node, self._parse_term())
 
     def _parse_term(self) -> Any:
         node = self._parse_power()
-        while self._peek().type == "OP" and self._peek().value in "*/":
-            op = self._advance().value
-            right = self._parse_power()
-            node = BinaryOpNode(op=op, left=node, right=right)
-        return node
+        tokens = self.tokens
+        while True:
+            token = tokens[self.index]
+            if token.type != "OP" or token.value not in "*/":
+                return node
+            self.index += 1
+            node = BinaryOpNode(token.value, node, self._parse_power())
 
     def _parse_power(self) -> Any:
         node = self._parse_unary()
-        if self._peek().type == "OP" and self._peek().value == "^":
-            op = self._advance().value
-            right = self._parse_power()
-            node = BinaryOpNode(op=op, left=node, right=right)
+        token = self.tokens[self.index]
+        if token.type == "OP" and token.value == "^":
+            self.index += 1
+            node = BinaryOpNode(token.value, node, self._parse_power())
         return node
 
     def _parse_unary(self) -> Any:
-        if self._peek().type == "OP" and self._peek().value in "+-":
-            op = self._advance().value
-            operand = self._parse_unary()
-            return UnaryOpNode(op=op, operand=operand)
+        token = self.tokens[self.index]
+        if token.type == "OP" and token.value in "+-":
+            self.index += 1
+            return UnaryOpNode(token.value, self._parse_unary())
         return self._parse_primary()
 
     def _parse_primary(self) -> Any:
-        token = self._peek()
-        if token.type == "NUMBER":
-            self._advance()
-            return NumberNode(value=float(token.value))
-        if token.type == "STRING":
-            self._advance()
-            return StringNode(value=token.value)
-        if token.type == "CELL":
+        token = self.tokens[self.index]
+        kind = token.type
+        if kind == "NUMBER":
+            self.index += 1
+            return _interned_number_node(float(token.value))
+        if kind == "CELL":
             return self._parse_reference()
-        if token.type == "IDENT":
+        if kind == "STRING":
+            self.index += 1
+            return StringNode(value=token.value)
+        if kind == "TABLEREF":
+            self.index += 1
+            table_id, ref = token.value.split(".", 1)
+            if not ref:
+                raise FormulaError("Invalid table reference")
+            if self._peek().type == "[":
+                return self._parse_table_region_reference(table_id, ref)
+            return self._parse_table_dot_reference(table_id, ref)
+        if kind == "IDENT":
             upper = token.value.upper()
-            if upper in {"COL", "ROW"} and self._peek(1).type == "(":
-                return self._parse_col_row_function()
-            if self._peek(1).type == "(":
+            following = self.tokens[self.index + 1].type
+            if following == "(":
+                if upper == "COL" or upper == "ROW":
+                    return self._parse_col_row_function()
                 return self._parse_function_call()
-            if "." in token.value:
-                dotted = self._advance().value
-                table_id, ref = dotted.split(".", 1)
-                if not table_id or not ref:
-                    raise FormulaError("Invalid table reference")
-                if self._peek().type == "[":
-                    return self._parse_table_region_reference(table_id, ref)
-                return self._parse_table_dot_reference(table_id, ref)
-            if self._peek(1).type == "[":
+            if following == "[":
                 return self._parse_reference()
             if upper == "TRUE" or upper == "FALSE":
                 self._advance()
                 return BoolNode(value=(upper == "TRUE"))
-        if token.type == "(":
-            self._advance()
+        if kind == "(":
+            self.index += 1
             expr = self._parse_comparison()
             if not self._match(")"):
                 raise FormulaError("Expected ')'")
@@ -751,7 +810,7 @@ class FormulaParser:
                     raise FormulaError("Expected ',' or ')' in function call")
         else:
             self._advance()
-        return FuncCallNode(name=name, args=args)
+        return FuncCallNode(name=name, args=tuple(args))
 
     def _parse_reference(self, table_id: Optional[str] = None) -> Any:
         token = self._peek()
@@ -765,19 +824,19 @@ class FormulaParser:
             if not self._match("]"):
                 raise FormulaError("Expected ']' in range reference")
             if start == end:
-                return CellRefNode(table_id=table_id, region=region, cell=start)
+                return _interned_cell_ref_node(table_id, region, start)
             return RangeRefNode(table_id=table_id, region=region, start=start, end=end)
         if token.type == "IDENT" and self._peek(1).type != "[":
             if table_id is not None:
                 col = self._parse_column_label(self._advance())
-                return ColumnRefNode(table_id=table_id, region="body", col=col)
+                return _interned_column_ref_node(table_id, "body", col)
         if token.type == "CELL":
             start = self._parse_cell_token()
             end = start
             if self._match(":"):
                 end = self._parse_cell_token()
             if start == end:
-                return CellRefNode(table_id=table_id, region="body", cell=start)
+                return _interned_cell_ref_node(table_id, "body", start)
             return RangeRefNode(table_id=table_id, region="body", start=start, end=end)
         raise FormulaError("Invalid reference syntax")
 
@@ -791,7 +850,7 @@ class FormulaParser:
         if not self._match("]"):
             raise FormulaError("Expected ']' in range reference")
         if start == end:
-            return CellRefNode(table_id=table_id, region=region, cell=start)
+            return _interned_cell_ref_node(table_id, region, start)
         return RangeRefNode(table_id=table_id, region=region, start=start, end=end)
 
     def _parse_table_dot_reference(self, table_id: str, ref: str) -> Any:
@@ -801,10 +860,10 @@ class FormulaParser:
             if self._match(":"):
                 end = self._parse_cell_token()
             if start == end:
-                return CellRefNode(table_id=table_id, region="body", cell=start)
+                return _interned_cell_ref_node(table_id, "body", start)
             return RangeRefNode(table_id=table_id, region="body", start=start, end=end)
         if ref.isalpha():
-            return ColumnRefNode(table_id=table_id, region="body", col=column_index(ref))
+            return _interned_column_ref_node(table_id, "body", column_index(ref))
         if ref.isdigit():
             row_number = int(ref)
             if row_number < 0:
@@ -819,21 +878,7 @@ class FormulaParser:
         return self._parse_cell_string(token.value)
 
     def _parse_cell_string(self, value: str) -> CellRef:
-        match = _CELL_REF_RE.fullmatch(value)
-        if not match:
-            raise FormulaError("Invalid cell reference")
-        col_abs = match.group(1) == "$"
-        row_abs = match.group(3) == "$"
-        col_label = match.group(2)
-        row_number = int(match.group(4))
-        if row_number < 0:
-            raise FormulaError("Invalid cell reference")
-        return CellRef(
-            row=row_number,
-            col=column_index(col_label),
-            row_abs=row_abs,
-            col_abs=col_abs,
-        )
+        return _interned_cell_ref(value)
 
     def _parse_column_label(self, token: Token) -> int:
         label = token.value
@@ -858,13 +903,13 @@ class FormulaParser:
             if token.type == "CELL":
                 cell = self._parse_cell_token()
                 col = cell.col
-            elif token.type == "IDENT":
+            elif token.type in ("IDENT", "TABLEREF"):
                 col = self._parse_column_label(self._advance())
             else:
                 raise FormulaError("Invalid COL reference")
             if not self._match(")"):
                 raise FormulaError("Expected ')' after COL")
-            return ColumnRefNode(table_id=None, region="body", col=col)
+            return _interned_column_ref_node(None, "body", col)
         if name == "ROW":
             if token.type == "CELL":
                 cell = self._parse_cell_token()
@@ -879,7 +924,56 @@ class FormulaParser:
         raise FormulaError(f"Unknown function: {name}")
 
 
-@dataclass(frozen=True)
+@lru_cache(maxsize=65536)
+def _interned_cell_ref(value: str) -> CellRef:
+    match = _CELL_REF_RE.fullmatch(value)
+    if not match:
+        raise FormulaError("Invalid cell reference")
+    col_abs = match.group(1) == "$"
+    row_abs = match.group(3) == "$"
+    col_label = match.group(2)
+    row_number = int(match.group(4))
+    if row_number < 0:
+        raise FormulaError("Invalid cell reference")
+    return CellRef(
+        row=row_number,
+        col=column_index(col_label),
+        row_abs=row_abs,
+        col_abs=col_abs,
+    )
+
+
+@lru_cache(maxsize=65536)
+def _interned_cell_ref_node(table_id: Optional[str], region: str, cell: CellRef) -> CellRefNode:
+    return CellRefNode(table_id=table_id, region=region, cell=cell)
+
+
+@lru_cache(maxsize=65536)
+def _interned_column_ref_node(table_id: Optional[str], region: str, col: int) -> ColumnRefNode:
+    return ColumnRefNode(table_id=table_id, region=region, col=col)
+
+
+@lru_cache(maxsize=4096)
+def _interned_number_node(value: float) -> NumberNode:
+    return NumberNode(value=value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_outcome(text: str) -> Any:
+    try:
+        return FormulaParser(text).parse()
+    except FormulaError as exc:
+        return exc
+
+
+def _parse_cached(text: str) -> Any:
+    ast = _parse_outcome(text)
+    if isinstance(ast, FormulaError):
+        raise FormulaError(*ast.args)
+    return ast
+
+
+@dataclass(frozen=True, slots=True)
 class FormulaContext:
     project: "Project"
     table: "Table"
@@ -889,6 +983,7 @@ class FormulaContext:
     target_col: int
 
 
+@lru_cache(maxsize=8192)
 def _normalize_ref(ref: str) -> str:
     trimmed = ref.strip()
     if "[" in trimmed:
@@ -922,6 +1017,8 @@ def _unwrap_value(value: Any) -> Any:
 
 
 def _resolve_cell_ref(cell: CellRef, context: FormulaContext) -> Tuple[int, int]:
+    if cell.row_abs and cell.col_abs:
+        return cell.row, cell.col
     row_offset = context.target_row - context.anchor_row
     col_offset = context.target_col - context.anchor_col
     row = cell.row if cell.row_abs else cell.row + row_offset
@@ -938,8 +1035,38 @@ def _resolve_table(context: FormulaContext, table_id: Optional[str]) -> "Table":
 
 
 def _cell_value(table: "Table", region: str, row: int, col: int) -> Any:
-    key = address(region, row, col)
-    return _unwrap_value(table.cell_values.get(key))
+    cell_values = table.cell_values
+    if isinstance(cell_values, _CellValues):
+        return cell_values.native(region, row, col)
+    return _unwrap_value(cell_values.get(address(region, row, col)))
+
+
+def _same_cell_value(previous: Any, value: Any) -> bool:
+    if previous is value:
+        return True
+    if type(previous) is not type(value) or isinstance(value, np.ndarray):
+        return False
+    return previous == value
+
+
+def _cell_value_differs(previous: Any, value: Any) -> bool:
+    try:
+        return bool(previous != value)
+    except (TypeError, ValueError):
+        return True
+
+
+def _region_block(table: "Table", region: str, row_start: int, row_end: int,
+                  col_start: int, col_end: int) -> List[List[Any]]:
+    cell_values = table.cell_values
+    if isinstance(cell_values, _CellValues):
+        block = cell_values.block(region, row_start, row_end, col_start, col_end)
+        if block is not None:
+            return block
+    return [
+        [_cell_value(table, region, row, col) for col in range(col_start, col_end + 1)]
+        for row in range(row_start, row_end + 1)
+    ]
 
 
 def _range_values(table: "Table", region: str, start: CellRef, end: CellRef,
@@ -948,25 +1075,25 @@ def _range_values(table: "Table", region: str, start: CellRef, end: CellRef,
     end_row, end_col = _resolve_cell_ref(end, context)
     row_start, row_end = sorted((start_row, end_row))
     col_start, col_end = sorted((start_col, end_col))
-    values: List[List[Any]] = []
-    for row in range(row_start, row_end + 1):
-        row_values = []
-        for col in range(col_start, col_end + 1):
-            row_values.append(_cell_value(table, region, row, col))
-        values.append(row_values)
-    return values
+    return _region_block(table, region, row_start, row_end, col_start, col_end)
 
 
 def _column_values(table: "Table", region: str, col: int) -> List[Any]:
     if region != "body":
         raise FormulaError("Column references require body region")
-    return [_cell_value(table, region, row, col) for row in range(table.grid_spec.bodyRows)]
+    rows = table.grid_spec.bodyRows
+    if rows <= 0:
+        return []
+    return [row[0] for row in _region_block(table, region, 0, rows - 1, col, col)]
 
 
 def _row_values(table: "Table", region: str, row: int) -> List[Any]:
     if region != "body":
         raise FormulaError("Row references require body region")
-    return [_cell_value(table, region, row, col) for col in range(table.grid_spec.bodyCols)]
+    cols = table.grid_spec.bodyCols
+    if cols <= 0:
+        return []
+    return _region_block(table, region, row, row, 0, cols - 1)[0]
 
 
 def _iter_values(value: Any) -> Iterable[Any]:
@@ -988,13 +1115,18 @@ def _coerce_number(value: Any) -> Optional[float]:
     if isinstance(value, (int, float, np.number)):
         return float(value)
     if isinstance(value, str):
-        try:
-            return float(value)
-        except ValueError:
-            return None
+        return _coerce_number_text(value)
     return None
 
 
+@lru_cache(maxsize=1024)
+def _coerce_number_text(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
 def _is_empty_value(value: Any) -> bool:
     if value is None:
         return True
@@ -1057,25 +1189,33 @@ def _comparison_operands(left: Any, right: Any) -> Tuple[Any, Any]:
     return str(left_value), str(right_value)
 
 
+_COMPARISON_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
 def _compare_values(left: Any, right: Any, op: str) -> bool:
     lhs, rhs = _comparison_operands(left, right)
-    if op == "=":
-        return lhs == rhs
-    if op == "<>":
-        return lhs != rhs
-    if op == "<":
-        return lhs < rhs
-    if op == "<=":
-        return lhs <= rhs
-    if op == ">":
-        return lhs > rhs
-    if op == ">=":
-        return lhs >= rhs
-    raise FormulaError(f"Unsupported comparison operator: {op}")
+    compare = _COMPARISON_OPERATORS.get(op)
+    if compare is None:
+        raise FormulaError(f"Unsupported comparison operator: {op}")
+    return compare(lhs, rhs)
 
 
 def _to_numeric_array(values: Any) -> np.ndarray:
     array = np.array(values, dtype=object)
+    astype = getattr(array, "astype", None)
+    if astype is not None:
+        try:
+            array[np.equal(array, None) | np.equal(array, "")] = math.nan
+            return astype(float)
+        except (TypeError, ValueError):
+            pass
 
     def convert(item: Any) -> float:
         number = _coerce_number(item)
@@ -1084,13 +1224,86 @@ def _to_numeric_array(values: Any) -> np.ndarray:
     return np.vectorize(convert, otypes=[float])(array)
 
 
+def _numeric_array(values: Any) -> Optional[np.ndarray]:
+    if (isinstance(values, list) and values and isinstance(values[0], list)
+            and len(values) * len(values[0]) >= _NUMERIC_ARRAY_THRESHOLD):
+        try:
+            values = np.array(values, dtype=object)
+        except (TypeError, ValueError):
+            return None
+    if not isinstance(values, np.ndarray) or not hasattr(values, "ravel"):
+        return None
+    if values.dtype.kind not in "biufO":
+        return None
+    flat = values.ravel()
+    if flat.dtype.kind == "O":
+        flat = flat[~(np.equal(flat, None) | np.equal(flat, ""))]
+    try:
+        return flat.astype(float)
+    except (TypeError, ValueError):
+        return None
+
+
+def _numeric_entry(value: Any) -> Tuple[float, int]:
+    kind = type(value)
+    if value is None or (kind is str and not value):
+        return 0.0, _NUMERIC_EMPTY
+    if kind not in _NUMERIC_CELL_TYPES and not isinstance(value, (np.integer, np.floating)):
+        return 0.0, _NUMERIC_OTHER
+    try:
+        return float(value), _NUMERIC_NUMBER
+    except (TypeError, ValueError, OverflowError):
+        return 0.0, _NUMERIC_TEXT if kind is str else _NUMERIC_OTHER
+
+
+def _numeric_grid(rows: List[List[Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    entries = np.array(list(map(_numeric_entry, chain.from_iterable(rows))), dtype=float)
+    shape = (len(rows), len(rows[0]))
+    return entries[:, 0].reshape(shape), entries[:, 1].astype(np.int8).reshape(shape)
+
+
+def _fsum(numbers: List[float]) -> float:
+    if not numbers:
+        return 0
+    try:
+        return math.fsum(numbers)
+    except (OverflowError, ValueError):
+        return sum(numbers, 0.0)
+
+
+def _sum_numeric(value: Any) -> Tuple[float, int]:
+    array = _numeric_array(value)
+    if array is not None:
+        return _fsum(array.tolist()), int(array.size)
+    numbers: List[float] = []
+    count = 0
+    nested = isinstance(value, (list, tuple))
+    if nested:
+        items: Iterable[Any] = value
+    elif isinstance(value, np.ndarray):
+        items = value.flat
+    else:
+        items = (value,)
+    for item in items:
+        if nested and isinstance(item, (list, tuple, np.ndarray)):
+            item_total, item_count = _sum_numeric(item)
+            if item_count:
+                numbers.append(item_total)
+                count += item_count
+            continue
+        number = _coerce_number(item)
+        if number is not None:
+            numbers.append(number)
+            count += 1
+    return _fsum(numbers), count
+
+
 def cs_sum(*args: Any, axis: Optional[int] = None) -> Any:
     if axis is not None:
         values = args[0] if len(args) == 1 else list(args)
         return np.nansum(_to_numeric_array(values), axis=axis)
     values = args[0] if len(args) == 1 else list(args)
-    numbers = _numeric_values(values)
-    return sum(numbers)
+    return _sum_numeric(values)[0]
 
 
 def cs_avg(*args: Any, axis: Optional[int] = None) -> Any:
@@ -1098,29 +1311,57 @@ def cs_avg(*args: Any, axis: Optional[int] = None) -> Any:
         values = args[0] if len(args) == 1 else list(args)
         return np.nanmean(_to_numeric_array(values), axis=axis)
     values = args[0] if len(args) == 1 else list(args)
-    numbers = _numeric_values(values)
-    if not numbers:
+    total, count = _sum_numeric(values)
+    if not count:
         return math.nan
-    return sum(numbers) / len(numbers)
+    return total / count
+
+
+def _numeric_extreme(numbers: np.ndarray, reduce: Any) -> Optional[float]:
+    if not numbers.size:
+        return None
+    first = float(numbers[0])
+    if math.isnan(first):
+        return first
+    return float(reduce.reduce(numbers))
 
 
 def cs_min(*args: Any) -> Any:
     values = args[0] if len(args) == 1 else list(args)
+    array = _numeric_array(values)
+    if array is not None:
+        return _numeric_extreme(array, np.fmin)
     numbers = _numeric_values(values)
     return min(numbers) if numbers else None
 
 
 def cs_max(*args: Any) -> Any:
     values = args[0] if len(args) == 1 else list(args)
+    array = _numeric_array(values)
+    if array is not None:
+        return _numeric_extreme(array, np.fmax)
     numbers = _numeric_values(values)
     return max(numbers) if numbers else None
 
 
 def cs_count(*args: Any) -> int:
     values = args[0] if len(args) == 1 else list(args)
+    array = _numeric_array(values)
+    if array is not None:
+        return int(array.size)
     return sum(1 for value in _iter_values(values) if _coerce_number(value) is not None)
 
 
+_RANGE_REDUCTIONS: Dict[str, Callable[[np.ndarray], Any]] = {
+    "SUM": lambda numbers: _fsum(numbers.tolist()),
+    "AVERAGE": lambda numbers: _fsum(numbers.tolist()) / numbers.size if numbers.size else math.nan,
+    "MIN": lambda numbers: _numeric_extreme(numbers, np.fmin),
+    "MAX": lambda numbers: _numeric_extreme(numbers, np.fmax),
+    "COUNT": lambda numbers: int(numbers.size),
+}
+_RANGE_REDUCED_FUNCTIONS = frozenset((*_RANGE_REDUCTIONS, "COUNTA"))
+
+
 def cs_counta(*args: Any) -> int:
     values = args[0] if len(args) == 1 else list(args)
     return sum(1 for value in _iter_values(values) if value not in (None, ""))
@@ -1265,138 +1506,400 @@ def cs_tan(value: Any) -> Any:
     return math.tan(_require_number(value))
 
 
-def _evaluate_formula(node: Any, context: FormulaContext) -> Any:
-    if isinstance(node, NumberNode):
-        return node.value
-    if isinstance(node, BoolNode):
-        return node.value
-    if isinstance(node, StringNode):
-        return node.value
-    if isinstance(node, UnaryOpNode):
-        value = _ensure_scalar(_evaluate_formula(node.operand, context))
-        if node.op == "-":
-            return -_require_number(value)
-        if node.op == "+":
-            return _require_number(value)
-        raise FormulaError(f"Unsupported unary operator: {node.op}")
-    if isinstance(node, BinaryOpNode):
-        left = _ensure_scalar(_evaluate_formula(node.left, context))
-        right = _ensure_scalar(_evaluate_formula(node.right, context))
-        if node.op in {"=", "<>", "<", "<=", ">", ">="}:
-            return _compare_values(left, right, node.op)
-        if node.op == "+":
-            return _require_number(left) + _require_number(right)
-        if node.op == "-":
-            return _require_number(left) - _require_number(right)
-        if node.op == "*":
-            return _require_number(left) * _require_number(right)
-        if node.op == "/":
-            return _require_number(left) / _require_number(right)
-        if node.op == "^":
-            return math.pow(_require_number(left), _require_number(right))
+_ARITHMETIC_OPERATORS: Dict[str, Callable[[float, float], float]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "^": math.pow,
+}
+
+
+def _evaluate_literal(node: Any, context: FormulaContext) -> Any:
+    return node.value
+
+
+def _evaluate_unary(node: UnaryOpNode, context: FormulaContext) -> Any:
+    value = _ensure_scalar(_evaluate_formula(node.operand, context))
+    if node.op == "-":
+        return -_require_number(value)
+    if node.op == "+":
+        return _require_number(value)
+    raise FormulaError(f"Unsupported unary operator: {node.op}")
+
+
+def _evaluate_binary(node: BinaryOpNode, context: FormulaContext) -> Any:
+    left = _ensure_scalar(_evaluate_formula(node.left, context))
+    right = _ensure_scalar(_evaluate_formula(node.right, context))
+    if node.op in _COMPARISON_OPERATORS:
+        return _compare_values(left, right, node.op)
+    arithmetic = _ARITHMETIC_OPERATORS.get(node.op)
+    if arithmetic is None:
         raise FormulaError(f"Unsupported operator: {node.op}")
-    if isinstance(node, FuncCallNode):
-        name = node.name.upper()
-        if "." in name:
-            name = name.split(".")[-1]
-        if name == "MEAN":
-            name = "AVERAGE"
-        args = [_evaluate_formula(arg, context) for arg in node.args]
-        if name == "SUM":
-            return cs_sum(*args)
-        if name == "AVERAGE":
-            return cs_avg(*args)
-        if name == "MIN":
-            return cs_min(*args)
-        if name == "MAX":
-            return cs_max(*args)
-        if name == "COUNT":
-            return cs_count(*args)
+    return arithmetic(_require_number(left), _require_number(right))
+
+
+def _evaluate_call(node: FuncCallNode, context: FormulaContext) -> Any:
+    name = _formula_function_name(node.name)
+    if name in _RANGE_REDUCED_FUNCTIONS and len(node.args) == 1 and type(node.args[0]) is RangeRefNode:
+        return _reduce_range(name, node.args[0], context)
+    args = [_evaluate_formula(arg, context) for arg in node.args]
+    return _call_formula_function(_formula_function_name(node.name), args)
+
+
+def _evaluate_cell_ref(node: CellRefNode, context: FormulaContext) -> Any:
+    table = _resolve_table(context, node.table_id)
+    row, col = _resolve_cell_ref(node.cell, context)
+    return _cell_value(table, node.region, row, col)
+
+
+def _reduce_range(name: str, node: RangeRefNode, context: FormulaContext) -> Any:
+    table = _resolve_table(context, node.table_id)
+    start_row, start_col = _resolve_cell_ref(node.start, context)
+    end_row, end_col = _resolve_cell_ref(node.end, context)
+    row_start, row_end = sorted((start_row, end_row))
+    col_start, col_end = sorted((start_col, end_col))
+    cell_values = table.cell_values
+    if (isinstance(cell_values, _CellValues)
+            and (row_end - row_start + 1) * (col_end - col_start + 1) >= _NUMERIC_ARRAY_THRESHOLD):
         if name == "COUNTA":
-            return cs_counta(*args)
-        if name == "IF":
-            if len(args) != 3:
-                raise FormulaError("IF requires 3 arguments")
-            return cs_if(args[0], args[1], args[2])
-        if name == "AND":
-            return cs_and(*args)
-        if name == "OR":
-            return cs_or(*args)
-        if name == "NOT":
-            if len(args) != 1:
-                raise FormulaError("NOT requires 1 argument")
-            return cs_not(args[0])
-        if name == "PMT":
-            if len(args) not in (3, 4, 5):
-                raise FormulaError("PMT requires 3 to 5 arguments")
-            return cs_pmt(*args)
-        if name == "ABS":
-            if len(args) != 1:
-                raise FormulaError("ABS requires 1 argument")
-            return cs_abs(args[0])
-        if name == "ROUND":
-            if len(args) not in (1, 2):
-                raise FormulaError("ROUND requires 1 or 2 arguments")
-            return cs_round(*args)
-        if name == "FLOOR":
-            if len(args) != 1:
-                raise FormulaError("FLOOR requires 1 argument")
-            return cs_floor(args[0])
-        if name == "CEIL":
-            if len(args) != 1:
-                raise FormulaError("CEIL requires 1 argument")
-            return cs_ceil(args[0])
-        if name == "SQRT":
-            if len(args) != 1:
-                raise FormulaError("SQRT requires 1 argument")
-            return cs_sqrt(args[0])
-        if name == "POWER":
-            if len(args) != 2:
-                raise FormulaError("POWER requires 2 arguments")
-            return cs_pow(args[0], args[1])
-        if name == "LOG":
-            if len(args) not in (1, 2):
-                raise FormulaError("LOG requires 1 or 2 arguments")
-            return cs_log(*args)
-        if name == "LOG10":
-            if len(args) != 1:
-                raise FormulaError("LOG10 requires 1 argument")
-            return cs_log10(args[0])
-        if name == "EXP":
-            if len(args) != 1:
-                raise FormulaError("EXP requires 1 argument")
-            return cs_exp(args[0])
-        if name == "SIN":
-            if len(args) != 1:
-                raise FormulaError("SIN requires 1 argument")
-            return cs_sin(args[0])
-        if name == "COS":
-            if len(args) != 1:
-                raise FormulaError("COS requires 1 argument")
-            return cs_cos(args[0])
-        if name == "TAN":
-            if len(args) != 1:
-                raise FormulaError("TAN requires 1 argument")
-            return cs_tan(args[0])
+            filled = cell_values.filled(node.region, row_start, row_end, col_start, col_end)
+            if filled is not None:
+                return filled
+        else:
+            numbers = cell_values.numbers(node.region, row_start, row_end, col_start, col_end)
+            if numbers is not None:
+                return _RANGE_REDUCTIONS[name](numbers)
+    block = _region_block(table, node.region, row_start, row_end, col_start, col_end)
+    return _call_formula_function(name, [block])
+
+
+def _evaluate_range_ref(node: RangeRefNode, context: FormulaContext) -> Any:
+    table = _resolve_table(context, node.table_id)
+    return _range_values(table, node.region, node.start, node.end, context)
+
+
+def _evaluate_column_ref(node: ColumnRefNode, context: FormulaContext) -> Any:
+    table = _resolve_table(context, node.table_id)
+    values = _column_values(table, node.region, node.col)
+    return np.array(values, dtype=object)
+
+
+def _evaluate_row_ref(node: RowRefNode, context: FormulaContext) -> Any:
+    table = _resolve_table(context, node.table_id)
+    values = _row_values(table, node.region, node.row)
+    return np.array(values, dtype=object)
+
+
+_FORMULA_EVALUATORS: Dict[type, Callable[[Any, FormulaContext], Any]] = {
+    NumberNode: _evaluate_literal,
+    BoolNode: _evaluate_literal,
+    StringNode: _evaluate_literal,
+    UnaryOpNode: _evaluate_unary,
+    BinaryOpNode: _evaluate_binary,
+    FuncCallNode: _evaluate_call,
+    CellRefNode: _evaluate_cell_ref,
+    RangeRefNode: _evaluate_range_ref,
+    ColumnRefNode: _evaluate_column_ref,
+    RowRefNode: _evaluate_row_ref,
+}
+
+
+def _evaluate_formula(node: Any, context: FormulaContext) -> Any:
+    evaluate = _FORMULA_EVALUATORS.get(type(node))
+    if evaluate is None:
+        raise FormulaError("Invalid formula")
+    return evaluate(node, context)
+
+
+def _formula_function_name(name: str) -> str:
+    name = name.upper()
+    if "." in name:
+        name = name.split(".")[-1]
+    if name == "MEAN":
+        name = "AVERAGE"
+    return name
+
+
+_FORMULA_FUNCTIONS: Dict[str, Tuple[Callable[..., Any], Optional[Tuple[int, ...]], str]] = {
+    "SUM": (cs_sum, None, ""),
+    "AVERAGE": (cs_avg, None, ""),
+    "MIN": (cs_min, None, ""),
+    "MAX": (cs_max, None, ""),
+    "COUNT": (cs_count, None, ""),
+    "COUNTA": (cs_counta, None, ""),
+    "IF": (cs_if, (3,), "IF requires 3 arguments"),
+    "AND": (cs_and, None, ""),
+    "OR": (cs_or, None, ""),
+    "NOT": (cs_not, (1,), "NOT requires 1 argument"),
+    "PMT": (cs_pmt, (3, 4, 5), "PMT requires 3 to 5 arguments"),
+    "ABS": (cs_abs, (1,), "ABS requires 1 argument"),
+    "ROUND": (cs_round, (1, 2), "ROUND requires 1 or 2 arguments"),
+    "FLOOR": (cs_floor, (1,), "FLOOR requires 1 argument"),
+    "CEIL": (cs_ceil, (1,), "CEIL requires 1 argument"),
+    "SQRT": (cs_sqrt, (1,), "SQRT requires 1 argument"),
+    "POWER": (cs_pow, (2,), "POWER requires 2 arguments"),
+    "LOG": (cs_log, (1, 2), "LOG requires 1 or 2 arguments"),
+    "LOG10": (cs_log10, (1,), "LOG10 requires 1 argument"),
+    "EXP": (cs_exp, (1,), "EXP requires 1 argument"),
+    "SIN": (cs_sin, (1,), "SIN requires 1 argument"),
+    "COS": (cs_cos, (1,), "COS requires 1 argument"),
+    "TAN": (cs_tan, (1,), "TAN requires 1 argument"),
+}
+
+
+def _call_formula_function(name: str, args: List[Any]) -> Any:
+    entry = _FORMULA_FUNCTIONS.get(name)
+    if entry is None:
         raise FormulaError(f"Unknown function: {name}")
-    if isinstance(node, CellRefNode):
-        table = _resolve_table(context, node.table_id)
-        row, col = _resolve_cell_ref(node.cell, context)
-        return _cell_value(table, node.region, row, col)
-    if isinstance(node, RangeRefNode):
-        table = _resolve_table(context, node.table_id)
-        return _range_values(table, node.region, node.start, node.end, context)
-    if isinstance(node, ColumnRefNode):
-        table = _resolve_table(context, node.table_id)
-        values = _column_values(table, node.region, node.col)
-        return np.array(values, dtype=object)
-    if isinstance(node, RowRefNode):
-        table = _resolve_table(context, node.table_id)
-        values = _row_values(table, node.region, node.row)
-        return np.array(values, dtype=object)
-    raise FormulaError("Invalid formula")
+    function, arities, message = entry
+    if arities is not None and len(args) not in arities:
+        raise FormulaError(message)
+    return function(*args)
+
+
+def _scalar_number(value: Any) -> float:
+    return _require_number(_ensure_scalar(value))
+
+
+def _numeric_operator(function: Callable[[float, float], float]) -> Callable[[Any, Any], float]:
+    def apply(left: Any, right: Any) -> float:
+        return function(_require_number(left), _require_number(right))
+    return apply
+
+
+_NUMERIC_OPERATORS = {op: _numeric_operator(function) for op, function in _ARITHMETIC_OPERATORS.items()}
+
+
+def _lower_literal(node: Any, constants: List[Any]) -> str:
+    value = node.value
+    if isinstance(value, (bool, str)) or (isinstance(value, float) and math.isfinite(value)):
+        return repr(value)
+    constants.append(value)
+    return f"_k[{len(constants) - 1}]"
+
+
+def _lower_unary(node: UnaryOpNode, constants: List[Any]) -> str:
+    operand = _lower_formula(node.operand, constants)
+    if node.op == "-":
+        return f"(-_number({operand}))"
+    if node.op == "+":
+        return f"_number({operand})"
+    raise FormulaError(f"Unsupported unary operator: {node.op}")
+
+
+def _lower_binary(node: BinaryOpNode, constants: List[Any]) -> str:
+    left = _lower_formula(node.left, constants)
+    right = _lower_formula(node.right, constants)
+    if node.op in _COMPARISON_OPERATORS:
+        return f"_compare(_scalar({left}), _scalar({right}), {node.op!r})"
+    if node.op in _NUMERIC_OPERATORS:
+        constants.append(_NUMERIC_OPERATORS[node.op])
+        return f"_k[{len(constants) - 1}](_scalar({left}), _scalar({right}))"
+    raise FormulaError(f"Unsupported operator: {node.op}")
+
+
+def _lower_call(node: FuncCallNode, constants: List[Any]) -> str:
+    name = _formula_function_name(node.name)
+    if name in _RANGE_REDUCED_FUNCTIONS and len(node.args) == 1 and type(node.args[0]) is RangeRefNode:
+        constants.append(node.args[0])
+        return f"_reduce({name!r}, _k[{len(constants) - 1}], _at(ctx, dr, dc))"
+    args = "".join(f"{_lower_formula(arg, constants)}, " for arg in node.args)
+    return f"_call({name!r}, [{args}])"
+
+
+def _relative_index(index: int, offset: int) -> int:
+    index += offset
+    if index < 0:
+        raise FormulaError("Reference out of bounds")
+    return index
+
+
+def _offset_context(ctx: FormulaContext, dr: int, dc: int) -> FormulaContext:
+    if not dr and not dc:
+        return ctx
+    return FormulaContext(ctx.project, ctx.table, ctx.anchor_row, ctx.anchor_col,
+                          ctx.anchor_row + dr, ctx.anchor_col + dc)
+
+
+def _lower_cell_ref(node: CellRefNode, constants: List[Any]) -> str:
+    cell = node.cell
+    if node.table_id is None:
+        table = "ctx.table"
+    else:
+        constants.append(node.table_id)
+        table = f"ctx.project.table(_k[{len(constants) - 1}])"
+    row = str(cell.row) if cell.row_abs else f"_offset({cell.row}, dr)"
+    col = str(cell.col) if cell.col_abs else f"_offset({cell.col}, dc)"
+    return f"_cell({table}, {node.region!r}, {row}, {col})"
+
+
+def _lower_reference(node: Any, constants: List[Any]) -> str:
+    constants.append(_FORMULA_EVALUATORS[type(node)])
+    constants.append(node)
+    return f"_k[{len(constants) - 2}](_k[{len(constants) - 1}], _at(ctx, dr, dc))"
+
+
+_FORMULA_LOWERERS: Dict[type, Callable[[Any, List[Any]], str]] = {
+    NumberNode: _lower_literal,
+    BoolNode: _lower_literal,
+    StringNode: _lower_literal,
+    UnaryOpNode: _lower_unary,
+    BinaryOpNode: _lower_binary,
+    FuncCallNode: _lower_call,
+    CellRefNode: _lower_cell_ref,
+    RangeRefNode: _lower_reference,
+    ColumnRefNode: _lower_reference,
+    RowRefNode: _lower_reference,
+}
+
+
+def _lower_formula(node: Any, constants: List[Any]) -> str:
+    lower = _FORMULA_LOWERERS.get(type(node))
+    if lower is None:
+        raise FormulaError("Invalid formula")
+    return lower(node, constants)
+
+
+_FORMULA_RUNTIME: Dict[str, Any] = {
+    "__builtins__": {},
+    "_number": _scalar_number,
+    "_scalar": _ensure_scalar,
+    "_compare": _compare_values,
+    "_call": _call_formula_function,
+    "_reduce": _reduce_range,
+    "_cell": _cell_value,
+    "_offset": _relative_index,
+    "_at": _offset_context,
+}
+
+
+def _compile_formula(ast: Any) -> Callable[[FormulaContext, int, int], Any]:
+    constants: List[Any] = []
+    source = _lower_formula(ast, constants)
+    try:
+        code = compile(f"lambda ctx, dr, dc: {source}", "<formula>", "eval")
+    except (SyntaxError, RecursionError, MemoryError):
+        return lambda ctx, dr, dc: _evaluate_formula(ast, _offset_context(ctx, dr, dc))
+    return eval(code, {**_FORMULA_RUNTIME, "_k": constants})
+
+
+@lru_cache(maxsize=4096)
+def _compile_cached(text: str) -> Callable[[FormulaContext, int, int], Any]:
+    return _compile_formula(_parse_cached(text))
+
+
+_VECTOR_OPERATORS = frozenset(("+", "-", "*", "/"))
+
+
+def _lower_vector(node: Any, refs: List[CellRefNode]) -> str:
+    kind = type(node)
+    if kind is NumberNode and not isinstance(node.value, bool):
+        value = float(node.value)
+        if not math.isfinite(value):
+            raise FormulaError("Unsupported literal")
+        return repr(value)
+    if kind is CellRefNode:
+        refs.append(node)
+        return f"_v[{len(refs) - 1}]"
+    if kind is UnaryOpNode and node.op in ("-", "+"):
+        return f"({node.op}{_lower_vector(node.operand, refs)})"
+    if kind is BinaryOpNode and node.op in _VECTOR_OPERATORS:
+        left = _lower_vector(node.left, refs)
+        right = _lower_vector(node.right, refs)
+        if node.op == "/":
+            return f"_divide({left}, {right}, _z)"
+        return f"({left} {node.op} {right})"
+    raise FormulaError("Unsupported vector formula")
+
+
+def _vector_divide(left: Any, right: Any, zeros: List[Any]) -> Any:
+    zeros.append(np.equal(right, 0.0))
+    return np.divide(left, right)
+
+
+@lru_cache(maxsize=4096)
+def _vector_kernel(text: str) -> Optional[Tuple[Callable[..., Any], Tuple[CellRefNode, ...]]]:
+    try:
+        ast = _parse_cached(text)
+        if type(ast) not in (UnaryOpNode, BinaryOpNode):
+            return None
+        refs: List[CellRefNode] = []
+        source = _lower_vector(ast, refs)
+    except (FormulaError, OverflowError, RecursionError):
+        return None
+    if not refs:
+        return None
+    code = compile(f"lambda _v, _z: {source}", "<formula>", "eval")
+    return eval(code, {"__builtins__": {}, "_divide": _vector_divide}), tuple(refs)
+
+
+def _vector_operand(table: "Table", ref: CellRefNode, height: int,
+                    width: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    cell_values = table.cell_values
+    if not isinstance(cell_values, _CellValues):
+        return None
+    cell = ref.cell
+    rows = 1 if cell.row_abs else height
+    cols = 1 if cell.col_abs else width
+    block = cell_values._numeric_slice(ref.region, cell.row, cell.row + rows - 1,
+                                       cell.col, cell.col + cols - 1)
+    if block is None:
+        return None
+    values = np.zeros((rows, cols))
+    kinds = np.full((rows, cols), _NUMERIC_EMPTY, dtype=np.int8)
+    found_values, found_kinds = block
+    values[:found_values.shape[0], :found_values.shape[1]] = found_values
+    kinds[:found_kinds.shape[0], :found_kinds.shape[1]] = found_kinds
+    return values, kinds <= _NUMERIC_NUMBER
+
+
+def _vector_fill(project: "Project", table: "Table", formula: str, region: str, start_row: int,
+                 start_col: int, end_row: int, end_col: int) -> Optional[List[List[Optional[float]]]]:
+    height = end_row - start_row + 1
+    width = end_col - start_col + 1
+    if height * width < _NUMERIC_ARRAY_THRESHOLD or not _NUMERIC_SHADOWS:
+        return None
+    kernel = _vector_kernel(formula)
+    if kernel is None:
+        return None
+    function, refs = kernel
+    operands = []
+    valid = np.ones((height, width), dtype=bool)
+    for ref in refs:
+        try:
+            source = table if ref.table_id is None else project.table(ref.table_id)
+        except Exception:
+            return None
+        cell = ref.cell
+        if source is table and ref.region == region:
+            row_end = cell.row if cell.row_abs else cell.row + height - 1
+            col_end = cell.col if cell.col_abs else cell.col + width - 1
+            if cell.row <= end_row and row_end >= start_row and cell.col <= end_col and col_end >= start_col:
+                return None
+        operand = _vector_operand(source, ref, height, width)
+        if operand is None:
+            return None
+        operands.append(operand[0])
+        valid &= operand[1]
+    zeros: List[Any] = []
+    with np.errstate(all="ignore"):
+        results = np.broadcast_to(function(operands, zeros), (height, width))
+    for zero in zeros:
+        valid &= ~zero
+    values = results.tolist()
+    if not valid.all():
+        for row, col in zip(*np.nonzero(~valid)):
+            values[row][col] = None
+    return values
+
 
 def _cell_value_to_json(value: Any) -> Dict[str, Any]:
+    kind = type(value)
+    if kind is float or kind is int:
+        return {"type": "number", "value": float(value)}
+    if kind is str:
+        return {"type": "string", "value": value}
     if isinstance(value, dict) and "type" in value:
         return value
     if value is None:
@@ -1414,7 +1917,7 @@ def _cell_value_to_json(value: Any) -> Dict[str, Any]:
     return {"type": "string", "value": str(value)}
 
 
-@dataclass
+@dataclass(slots=True)
 class Rect:
     x: float
     y: float
@@ -1424,7 +1927,7 @@ class Rect:
     @staticmethod
     def from_value(value: Any) -> "Rect":
         if isinstance(value, Rect):
-            return value
+            return Rect(value.x, value.y, value.width, value.height)
         if isinstance(value, (list, tuple)) and len(value) == 4:
             return Rect(float(value[0]), float(value[1]), float(value[2]), float(value[3]))
         if isinstance(value, dict):
@@ -1435,7 +1938,7 @@ class Rect:
         return {"x": self.x, "y": self.y, "width": self.width, "height": self.height}
 
 
-@dataclass
+@dataclass(slots=True)
 class LabelBands:
     topRows: int
     bottomRows: int
@@ -1466,7 +1969,7 @@ class LabelBands:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GridSpec:
     bodyRows: int
     bodyCols: int
@@ -1480,7 +1983,7 @@ class GridSpec:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryValueSpec:
     col: int
     agg: str
@@ -1489,7 +1992,7 @@ class SummaryValueSpec:
         return {"col": int(self.col), "agg": str(self.agg)}
 
 
-@dataclass
+@dataclass(slots=True)
 class SummarySpec:
     source_table_id: str
     source_range: Optional[str]
@@ -1505,7 +2008,7 @@ class SummarySpec:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Chart:
     id: str
     name: str
@@ -1570,6 +2073,387 @@ class Chart:
             self.show_legend = bool(show_legend)
 
 
+_CELL_KEY_RE = re.compile(r"([^\[]+)\[([A-Z]+)(0|[1-9][0-9]*)\]")
+
+
+@lru_cache(maxsize=65536)
+def _parse_cell_key(key: str) -> Optional[Tuple[str, int, int]]:
+    match = _CELL_KEY_RE.fullmatch(key)
+    if match is None:
+        return None
+    region, letters, digits = match.groups()
+    if region[0].isspace() or region[-1].isspace():
+        return None
+    return region, int(digits), column_index(letters)
+
+
+class _CellValues(dict):
+    _grids: Optional[Dict[str, Optional[List[List[Any]]]]] = None
+    _encoded: Optional[Dict[str, Any]] = None
+    _stale: Optional[set] = None
+    _reordered = False
+    _changes: Optional[List[Any]] = None
+    _numbers: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        dict.__setitem__(self, key, value)
+        if self._grids:
+            self._store(key, value)
+        if self._encoded is not None:
+            self._stale.add(key)
+        if self._changes is not None:
+            self._log_changes((key,))
+
+    def __delitem__(self, key: Any) -> None:
+        dict.__delitem__(self, key)
+        if self._grids:
+            self._store(key, None)
+        if self._encoded is not None:
+            self._stale.add(key)
+            self._reordered = True
+        if self._changes is not None:
+            self._log_changes((key,))
+
+    def __ior__(self, other: Any) -> "_CellValues":
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        items = dict(*args, **kwargs)
+        dict.update(self, items)
+        if self._grids:
+            for key, value in items.items():
+                self._store(key, value)
+        if self._encoded is not None:
+            self._stale.update(items)
+        if self._changes is not None:
+            self._log_changes(items)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        value = dict.pop(self, key, *default)
+        if self._grids:
+            self._store(key, None)
+        if self._encoded is not None:
+            self._stale.add(key)
+            self._reordered = True
+        if self._changes is not None:
+            self._log_changes((key,))
+        return value
+
+    def popitem(self) -> Tuple[Any, Any]:
+        item = dict.popitem(self)
+        if self._grids:
+            self._store(item[0], None)
+        if self._encoded is not None:
+            self._stale.add(item[0])
+            self._reordered = True
+        if self._changes is not None:
+            self._log_changes((item[0],))
+        return item
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._grids = None
+        self._encoded = None
+        self._changes = None
+        self._numbers = None
+
+    def _log_changes(self, keys: Iterable[Any]) -> None:
+        changes = self._changes
+        changes.extend(keys)
+        if len(changes) > _CHANGE_LOG_LIMIT:
+            self._changes = None
+
+    def encoded(self) -> Dict[str, Any]:
+        encoded = self._encoded
+        if encoded is None:
+            encoded = self._encoded = {key: _cell_value_to_json(value) for key, value in self.items()}
+            self._stale = set()
+            self._reordered = False
+            return dict(encoded)
+        stale = self._stale
+        if stale:
+            reordered = self._reordered
+            for key in stale:
+                if dict.__contains__(self, key):
+                    reordered = reordered or key not in encoded
+                    encoded[key] = _cell_value_to_json(dict.__getitem__(self, key))
+                else:
+                    encoded.pop(key, None)
+            stale.clear()
+            if reordered:
+                encoded = self._encoded = {key: encoded[key] for key in self}
+            self._reordered = False
+        return dict(encoded)
+
+    def _store(self, key: Any, value: Any) -> None:
+        parsed = _parse_cell_key(key) if isinstance(key, str) else None
+        if parsed is None:
+            return
+        region, row, col = parsed
+        rows = self._grow(region, row, col)
+        if rows is not None:
+            value = rows[row][col] = _unwrap_value(value)
+            numbers = self._numbers
+            if numbers and region in numbers:
+                values, kinds = numbers[region]
+                values[row, col], kinds[row, col] = _numeric_entry(value)
+
+    def _grow(self, region: str, row: int, col: int) -> Optional[List[List[Any]]]:
+        rows = self._grids.get(region)
+        if rows is None:
+            return None
+        if row >= len(rows) or col >= len(rows[0]):
+            if self._numbers:
+                self._numbers.pop(region, None)
+            height = max(row + 1, len(rows))
+            width = max(col + 1, len(rows[0]))
+            if height * width > _GRID_CELL_LIMIT:
+                self._grids[region] = None
+                return None
+            for existing in rows:
+                existing.extend([None] * (width - len(existing)))
+            rows.extend([None] * width for _ in range(height - len(rows)))
+        return rows
+
+    def set_block(self, region: str, row_start: int, col_start: int,
+                  keys: List[List[str]], values: List[List[Any]]) -> None:
+        flat_keys = list(chain.from_iterable(keys))
+        dict.update(self, zip(flat_keys, chain.from_iterable(values)))
+        if self._grids:
+            col_end = col_start + len(values[0])
+            rows = self._grow(region, row_start + len(values) - 1, col_end - 1)
+            if rows is not None:
+                block = [[_unwrap_value(value) if isinstance(value, dict) else value for value in row_values]
+                         for row_values in values]
+                for row, row_values in enumerate(block, row_start):
+                    rows[row][col_start:col_end] = row_values
+                numbers = self._numbers
+                if numbers and region in numbers:
+                    shadow_values, shadow_kinds = numbers[region]
+                    block_values, block_kinds = _numeric_grid(block)
+                    row_end = row_start + len(block)
+                    shadow_values[row_start:row_end, col_start:col_end] = block_values
+                    shadow_kinds[row_start:row_end, col_start:col_end] = block_kinds
+        if self._encoded is not None:
+            self._stale.update(flat_keys)
+        if self._changes is not None:
+            self._log_changes(flat_keys)
+
+    def _region_rows(self, region: str) -> Optional[List[List[Any]]]:
+        grids = self._grids
+        if grids is None:
+            grids = self._grids = {}
+        if region in grids:
+            return grids[region]
+        cells: List[Tuple[int, int, Any]] = []
+        height = width = 1
+        for key, value in self.items():
+            parsed = _parse_cell_key(key) if isinstance(key, str) else None
+            if parsed is None or parsed[0] != region:
+                continue
+            _, row, col = parsed
+            height = max(height, row + 1)
+            width = max(width, col + 1)
+            cells.append((row, col, value))
+        rows: Optional[List[List[Any]]] = None
+        if height * width <= _GRID_CELL_LIMIT:
+            rows = [[None] * width for _ in range(height)]
+            for row, col, value in cells:
+                rows[row][col] = _unwrap_value(value)
+        grids[region] = rows
+        return rows
+
+    def block(self, region: str, row_start: int, row_end: int,
+              col_start: int, col_end: int) -> Optional[List[List[Any]]]:
+        rows = self._region_rows(region)
+        if rows is None:
+            return None
+        width = col_end - col_start + 1
+        block = [row[col_start:col_end + 1] for row in rows[row_start:row_end + 1]]
+        if col_end >= len(rows[0]):
+            for row in block:
+                row.extend([None] * (width - len(row)))
+        missing = row_end - row_start + 1 - len(block)
+        if missing > 0:
+            block.extend([None] * width for _ in range(missing))
+        return block
+
+    def _numeric_slice(self, region: str, row_start: int, row_end: int,
+                       col_start: int, col_end: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if not _NUMERIC_SHADOWS:
+            return None
+        numbers = self._numbers
+        if numbers is None:
+            numbers = self._numbers = {}
+        shadow = numbers.get(region)
+        if shadow is None:
+            rows = self._region_rows(region)
+            if rows is None:
+                return None
+            shadow = numbers[region] = _numeric_grid(rows)
+        values, kinds = shadow
+        return (values[row_start:row_end + 1, col_start:col_end + 1],
+                kinds[row_start:row_end + 1, col_start:col_end + 1])
+
+    def numbers(self, region: str, row_start: int, row_end: int,
+                col_start: int, col_end: int) -> Optional[np.ndarray]:
+        block = self._numeric_slice(region, row_start, row_end, col_start, col_end)
+        if block is None:
+            return None
+        values, kinds = block
+        if (kinds >= _NUMERIC_TEXT).any():
+            return None
+        return values[kinds == _NUMERIC_NUMBER]
+
+    def filled(self, region: str, row_start: int, row_end: int,
+               col_start: int, col_end: int) -> Optional[int]:
+        block = self._numeric_slice(region, row_start, row_end, col_start, col_end)
+        if block is None:
+            return None
+        kinds = block[1]
+        if (kinds == _NUMERIC_OTHER).any():
+            return None
+        return int(np.count_nonzero(kinds))
+
+    def native(self, region: str, row: int, col: int) -> Any:
+        rows = self._region_rows(region)
+        if rows is None:
+            return _unwrap_value(self.get(address(region, row, col)))
+        if 0 <= row < len(rows):
+            values = rows[row]
+            if 0 <= col < len(values):
+                return values[col]
+        return None
+
+
+def _row_buckets(row_start: int, row_end: int) -> Tuple[int, ...]:
+    first = row_start // _ORDER_BUCKET_ROWS
+    last = row_end // _ORDER_BUCKET_ROWS
+    if last - first > _ORDER_BUCKET_SPAN:
+        return (-1,)
+    return tuple(range(first, last + 1))
+
+
+@lru_cache(maxsize=65536)
+def _formula_key_bounds(key: str) -> Optional[Tuple[str, int, int, int, int]]:
+    try:
+        return _range_bounds(parse_range(_normalize_ref(key)))
+    except RangeParserError:
+        return None
+
+
+class _FormulaMap(dict):
+    _cells: Optional[Dict[Tuple[str, int, int], set]] = None
+    _spans: Optional[Dict[int, Dict[str, Tuple[str, int, int, int, int]]]] = None
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if self._cells is not None and not dict.__contains__(self, key):
+            self._index(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        dict.__delitem__(self, key)
+        if self._cells is not None:
+            self._unindex(key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        present = dict.__contains__(self, key)
+        value = dict.pop(self, key, *default)
+        if present and self._cells is not None:
+            self._unindex(key)
+        return value
+
+    def popitem(self) -> Tuple[Any, Any]:
+        item = dict.popitem(self)
+        if self._cells is not None:
+            self._unindex(item[0])
+        return item
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._cells = None
+        self._spans = None
+
+    def _index(self, key: Any) -> None:
+        bounds = _formula_key_bounds(key)
+        if bounds is None:
+            return
+        region, row_start, row_end, col_start, col_end = bounds
+        if row_start == row_end and col_start == col_end:
+            self._cells.setdefault((region, row_start, col_start), set()).add(key)
+        else:
+            for bucket in _row_buckets(row_start, row_end):
+                self._spans.setdefault(bucket, {})[key] = bounds
+
+    def _unindex(self, key: Any) -> None:
+        bounds = _formula_key_bounds(key)
+        if bounds is None:
+            return
+        region, row_start, row_end, col_start, col_end = bounds
+        if row_start == row_end and col_start == col_end:
+            keys = self._cells.get((region, row_start, col_start))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[(region, row_start, col_start)]
+        else:
+            for bucket in _row_buckets(row_start, row_end):
+                spans = self._spans.get(bucket)
+                if spans is not None:
+                    spans.pop(key, None)
+                    if not spans:
+                        del self._spans[bucket]
+
+    def overlapping(self, region: str, row_start: int, row_end: int,
+                    col_start: int, col_end: int) -> List[Any]:
+        cells = self._cells
+        if cells is None:
+            cells = self._cells = {}
+            self._spans = {}
+            for key in self:
+                self._index(key)
+        found: List[Any] = []
+        if (row_end - row_start + 1) * (col_end - col_start + 1) <= len(cells):
+            for row in range(row_start, row_end + 1):
+                for col in range(col_start, col_end + 1):
+                    keys = cells.get((region, row, col))
+                    if keys:
+                        found.extend(keys)
+        else:
+            for (cell_region, row, col), keys in cells.items():
+                if (cell_region == region and row_start <= row <= row_end
+                        and col_start <= col <= col_end):
+                    found.extend(keys)
+        buckets = _row_buckets(row_start, row_end)
+        if buckets == (-1,):
+            candidates = self._spans.values()
+        else:
+            candidates = [self._spans[bucket] for bucket in chain(buckets, (-1,)) if bucket in self._spans]
+        seen = set()
+        for spans in candidates:
+            for key, bounds in spans.items():
+                if (key not in seen and bounds[0] == region and bounds[1] <= row_end and bounds[2] >= row_start
+                        and bounds[3] <= col_end and bounds[4] >= col_start):
+                    seen.add(key)
+                    found.append(key)
+        return found
+
+
 @dataclass
 class Table:
     id: str
@@ -1586,6 +2470,7 @@ class Table:
     )
     summary_spec: Optional[SummarySpec] = None
     summary_order: Optional[int] = None
+    _range_encoding = None
 
     def __post_init__(self) -> None:
         self._normalize_column_types()
@@ -1599,12 +2484,17 @@ class Table:
             self.body_column_types = self.body_column_types[:target]
 
     def __getattr__(self, name: str) -> Any:
-        if _FORMULA_CELL_RE.match(name):
-            cell_ref = name.upper()
-            return FormulaExpr(f"{self.id}.{cell_ref}")
+        if name[:1] != "_":
+            expr = _formula_attribute_expr(self.id, ".", name, "")
+            if expr is not None:
+                return FormulaExpr(expr)
         raise AttributeError(name)
 
     def __setattr__(self, name: str, value: Any) -> None:
+        if name == "cell_values" and not isinstance(value, _CellValues):
+            value = _CellValues(value)
+        elif name == "formulas" and not isinstance(value, _FormulaMap):
+            value = _FormulaMap(value)
         if name.startswith("_") or name in getattr(self, "__dataclass_fields__", {}):
             return object.__setattr__(self, name, value)
         if _FORMULA_CELL_RE.match(name):
@@ -1623,7 +2513,7 @@ class Table:
             if _active_formula_table is self:
                 return FormulaExpr(cell_ref)
             return FormulaExpr(f"{self.id}.{cell_ref}")
-        return _unwrap_value(self.cell_values.get(address("body", row, col)))
+        return _cell_value(self, "body", row, col)
 
     def __setitem__(self, key: Any, value: Any) -> None:
         row, col = _normalize_table_index(key)
@@ -1672,16 +2562,15 @@ class Table:
 
     def _remove_formulas_overlapping(self,
                                      edited_ranges: List[Tuple[str, int, int, int, int]]) -> None:
-        if not edited_ranges:
+        formulas = self.formulas
+        if not edited_ranges or not formulas:
             return
-        for formula_key in list(self.formulas.keys()):
-            try:
-                formula_range = parse_range(_normalize_ref(formula_key))
-            except RangeParserError:
-                continue
-            if any(_ranges_intersect(formula_range, edited) for edited in edited_ranges):
-                self.formulas.pop(formula_key, None)
-                self.formula_order.pop(formula_key, None)
+        overlapping = set()
+        for edited in edited_ranges:
+            overlapping.update(formulas.overlapping(*_range_bounds(edited)))
+        for formula_key in overlapping:
+            formulas.pop(formula_key, None)
+            self.formula_order.pop(formula_key, None)
 
     def set_cells(self, mapping: Dict[str, Any]) -> None:
         max_row: Optional[int] = None
@@ -1703,8 +2592,7 @@ class Table:
         self._remove_formulas_overlapping(edited_ranges)
         if max_row is not None and max_col is not None:
             self._ensure_body_size(max_row + 1, max_col + 1)
-        for key, value in mapping.items():
-            self.cell_values[key] = value
+        self.cell_values.update(mapping)
 
     def set_range(self, range_str: str, values: List[List[Any]], dtype: Optional[str] = None) -> None:
         normalized_values = _rectangularize_values(values, fill=None)
@@ -1721,12 +2609,11 @@ class Table:
                 end_row = start_row + value_rows - 1
                 end_col = start_col + value_cols - 1
                 self._ensure_body_size(end_row + 1, end_col + 1)
-        for row_index, row_values in enumerate(normalized_values):
-            for col_index, value in enumerate(row_values):
-                row = start_row + row_index
-                col = start_col + col_index
-                key = address(region, row, col)
-                self.cell_values[key] = value
+        if not normalized_values or not normalized_values[0]:
+            return
+        keys = _address_block(region, start_row, start_row + len(normalized_values) - 1,
+                              start_col, start_col + len(normalized_values[0]) - 1)
+        self.cell_values.set_block(region, start_row, start_col, keys, normalized_values)
 
     def clear_range(self, range_str: str) -> None:
         self.range_values.pop(range_str, None)
@@ -1768,9 +2655,21 @@ class Table:
     def minimize(self) -> None:
         max_row: Optional[int] = None
         max_col: Optional[int] = None
+        body_rows: List[int] = []
+        body_labels = set()
+        match = _CELL_KEY_RE.fullmatch
         for key, value in self.cell_values.items():
             if value in (None, ""):
                 continue
+            found = match(key) if isinstance(key, str) else None
+            if found is not None:
+                region, letters, digits = found.groups()
+                if region == "body":
+                    body_rows.append(int(digits))
+                    body_labels.add(letters)
+                    continue
+                if region == region.strip():
+                    continue
             try:
                 region, start_row, start_col, end_row, end_col = parse_range(key)
             except RangeParserError:
@@ -1781,6 +2680,11 @@ class Table:
             col = max(start_col, end_col)
             max_row = row if max_row is None else max(max_row, row)
             max_col = col if max_col is None else max(max_col, col)
+        if body_rows:
+            row = max(body_rows)
+            col = max(map(column_index, body_labels))
+            max_row = row if max_row is None else max(max_row, row)
+            max_col = col if max_col is None else max(max_col, col)
         for key, payload in self.formulas.items():
             formula = payload.get("formula") if isinstance(payload, dict) else None
             if not formula or not str(formula).strip():
@@ -1837,7 +2741,8 @@ class Table:
         entries.sort(key=lambda entry: entry[0])
         return entries
 
-    def apply_formula_entry(self, project: "Project", target_range: str, payload: Dict[str, Any]) -> bool:
+    def apply_formula_entry(self, project: "Project", target_range: str, payload: Dict[str, Any],
+                            offsets: Optional[List[Tuple[int, int]]] = None) -> bool:
         changed = False
         formula = str(payload.get("formula", "")).strip()
         if not formula:
@@ -1848,63 +2753,84 @@ class Table:
         except RangeParserError:
             return changed
 
+        keys = _address_block(region, start_row, end_row, start_col, end_col)
+        cell_values = self.cell_values
+        if mode == "spreadsheet":
+            try:
+                evaluate = _compile_cached(formula)
+            except FormulaError:
+                mode = None
         if mode != "spreadsheet":
-            for row in range(start_row, end_row + 1):
-                for col in range(start_col, end_col + 1):
-                    key = address(region, row, col)
-                    if self.cell_values.get(key) != "#ERROR":
-                        changed = True
-                    self.cell_values[key] = "#ERROR"
-            return changed
-
-        try:
-            ast = FormulaParser(formula).parse()
-        except FormulaError:
-            for row in range(start_row, end_row + 1):
-                for col in range(start_col, end_col + 1):
-                    key = address(region, row, col)
-                    if self.cell_values.get(key) != "#ERROR":
+            for row_keys in keys:
+                for key in row_keys:
+                    if cell_values.get(key) != "#ERROR":
                         changed = True
-                    self.cell_values[key] = "#ERROR"
+                        cell_values[key] = "#ERROR"
             return changed
 
-        for row in range(start_row, end_row + 1):
-            for col in range(start_col, end_col + 1):
-                context = FormulaContext(
-                    project=project,
-                    table=self,
-                    anchor_row=start_row,
-                    anchor_col=start_col,
-                    target_row=row,
-                    target_col=col,
-                )
+        context = FormulaContext(
+            project=project,
+            table=self,
+            anchor_row=start_row,
+            anchor_col=start_col,
+            target_row=start_row,
+            target_col=start_col,
+        )
+        vectorized = None
+        if offsets is None:
+            cells = ((row_offset, col_offset, key)
+                     for row_offset, row_keys in enumerate(keys)
+                     for col_offset, key in enumerate(row_keys))
+            vectorized = _vector_fill(project, self, formula, region, start_row, start_col, end_row, end_col)
+        else:
+            cells = ((row_offset, col_offset, keys[row_offset][col_offset])
+                     for row_offset, col_offset in offsets)
+        for row_offset, col_offset, key in cells:
+            value = None if vectorized is None else vectorized[row_offset][col_offset]
+            if value is None:
                 try:
-                    value = _evaluate_formula(ast, context)
+                    value = evaluate(context, row_offset, col_offset)
                 except Exception:
                     value = "#ERROR"
-                key = address(region, row, col)
-                if self.cell_values.get(key) != value:
-                    changed = True
-                self.cell_values[key] = value
+            previous = cell_values.get(key, _UNSET)
+            if previous is value or _same_cell_value(previous, value):
+                continue
+            cell_values[key] = value
+            if not changed:
+                if previous is _UNSET:
+                    previous = None
+                changed = type(previous) is type(value) or _cell_value_differs(previous, value)
         return changed
 
     def apply_formulas(self, project: "Project") -> bool:
         changed = False
-        for _, target_range, payload in self._iter_formulas_by_order():
+        entries = [(order, "formula", (self, target_range, payload))
+                   for order, target_range, payload in self._iter_formulas_by_order()]
+        for (_, _, (_, target_range, payload)), _, _, _ in _formula_evaluation_order(entries):
             if self.apply_formula_entry(project, target_range, payload):
                 changed = True
         return changed
 
     def _encode_cell_values(self) -> Dict[str, Any]:
+        if isinstance(self.cell_values, _CellValues):
+            return self.cell_values.encoded()
         return {key: _cell_value_to_json(value) for key, value in self.cell_values.items()}
 
     def _encode_range_values(self) -> Dict[str, Any]:
         encoded: Dict[str, Any] = {}
+        previous = self._range_encoding or {}
+        cache: Dict[str, Tuple[Any, List[List[Any]]]] = {}
         for key, payload in self.range_values.items():
             values = payload.get("values", [])
             dtype = payload.get("dtype")
-            encoded_values = [[_cell_value_to_json(value) for value in row] for row in values]
-            encoded[key] = {"values": encoded_values, "dtype": dtype}
+            cached = previous.get(key)
+            if cached is not None and cached[0] is values:
+                encoded_values = cached[1]
+            else:
+                encoded_values = [[_cell_value_to_json(value) for value in row] for row in values]
+            cache[key] = (values, encoded_values)
+            encoded[key] = {"values": [list(row) for row in encoded_values], "dtype": dtype}
+        self._range_encoding = cache
         return encoded
 
     def to_dict(self) -> Dict[str, Any]:
@@ -1924,6 +2850,7 @@ class Table:
         return payload
 
 
+@lru_cache(maxsize=8192)
 def _parse_col_ref(ref: str) -> Tuple[str, int]:
     trimmed = ref.strip()
     if "[" in trimmed and trimmed.endswith("]"):
@@ -2015,46 +2942,59 @@ def _is_summary_empty(value: Any) -> bool:
     return False
 
 
-class _SummaryAccumulator:
-    def __init__(self, agg: str) -> None:
-        self.agg = agg
-        self.count = 0
-        self.total = 0.0
-        self.minimum: Optional[float] = None
-        self.maximum: Optional[float] = None
-
-    def add(self, value: Any) -> None:
-        if _is_summary_empty(value):
-            return
-        if self.agg == "count":
-            self.count += 1
-            return
-        numeric = _summary_number(value)
-        if numeric is None:
-            return
-        if self.agg in ("sum", "avg"):
-            self.total += numeric
-            self.count += 1
-            return
-        if self.agg == "min":
-            self.minimum = numeric if self.minimum is None else min(self.minimum, numeric)
-            return
-        if self.agg == "max":
-            self.maximum = numeric if self.maximum is None else max(self.maximum, numeric)
-            return
-
-    def finalize(self) -> Any:
-        if self.agg == "count":
-            return self.count
-        if self.agg == "sum":
-            return self.total if self.count > 0 else None
-        if self.agg == "avg":
-            return (self.total / self.count) if self.count > 0 else None
-        if self.agg == "min":
-            return self.minimum
-        if self.agg == "max":
-            return self.maximum
-        return None
+def _summary_column(values: List[Any], codes: List[int],
+                    numeric: bool) -> Tuple[List[int], List[int], List[float]]:
+    filled: List[int] = []
+    numeric_codes: List[int] = []
+    numbers: List[float] = []
+    for code, value in zip(codes, values):
+        if code < 0 or _is_summary_empty(value):
+            continue
+        filled.append(code)
+        if numeric:
+            number = _summary_number(value)
+            if number is not None:
+                numeric_codes.append(code)
+                numbers.append(number)
+    return filled, numeric_codes, numbers
+
+
+def _summary_bincount(codes: List[int], group_count: int,
+                      weights: Optional[List[float]] = None) -> List[Any]:
+    bincount = getattr(np, "bincount", None)
+    if bincount is not None:
+        array = np.array(codes, dtype=np.intp)
+        if weights is None:
+            return bincount(array, minlength=group_count).tolist()
+        return bincount(array, weights=np.array(weights, dtype=float), minlength=group_count).tolist()
+    if weights is None:
+        counts = [0] * group_count
+        for code in codes:
+            counts[code] += 1
+        return counts
+    totals = [0.0] * group_count
+    for code, weight in zip(codes, weights):
+        totals[code] += weight
+    return totals
+
+
+def _summary_aggregate(agg: str, group_count: int,
+                       column: Tuple[List[int], List[int], List[float]]) -> List[Any]:
+    filled, numeric_codes, numbers = column
+    if agg == "count":
+        return _summary_bincount(filled, group_count)
+    if agg in ("sum", "avg"):
+        counts = _summary_bincount(numeric_codes, group_count)
+        totals = _summary_bincount(numeric_codes, group_count, numbers)
+        if agg == "sum":
+            return [total if count else None for total, count in zip(totals, counts)]
+        return [total / count if count else None for total, count in zip(totals, counts)]
+    best: List[Optional[float]] = [None] * group_count
+    for code, number in zip(numeric_codes, numbers):
+        current = best[code]
+        if current is None or (number < current if agg == "min" else number > current):
+            best[code] = number
+    return best
 
 
 def _summary_number(value: Any) -> Optional[float]:
@@ -2075,10 +3015,6 @@ def _apply_summary_table(project: "Project", summary_table: Table) -> None:
     value_specs = list(spec.values)
     if not value_specs:
         return
-    group_order: List[Tuple[Any, ...]] = []
-    aggregates: Dict[Tuple[Any, ...], List[_SummaryAccumulator]] = {}
-    group_values_map: Dict[Tuple[Any, ...], List[Any]] = {}
-
     if source.grid_spec.bodyRows <= 0:
         body_rows = 0
     else:
@@ -2104,25 +3040,39 @@ def _apply_summary_table(project: "Project", summary_table: Table) -> None:
             if not value_specs:
                 return
 
-    for row in range(row_start, row_end + 1):
-        group_values = [_unwrap_value(source.cell_values.get(address("body", row, col)))
-                        for col in group_by]
-        if group_by and all(_is_summary_empty(value) for value in group_values):
-            continue
-        key = tuple(_summary_key_component(value) for value in group_values)
-        if key not in aggregates:
-            aggregates[key] = [_SummaryAccumulator(spec.agg) for spec in value_specs]
-            group_values_map[key] = group_values
-            group_order.append(key)
-        for accumulator, value_spec in zip(aggregates[key], value_specs):
-            value = _unwrap_value(source.cell_values.get(address("body", row, value_spec.col)))
-            accumulator.add(value)
+    needed = sorted({*group_by, *(value_spec.col for value_spec in value_specs)})
+    block = _region_block(source, "body", row_start, row_end, needed[0], needed[-1])
+    columns = {col: [row[col - needed[0]] for row in block] for col in needed}
+    group_order: List[Tuple[Any, ...]] = []
+    group_codes: Dict[Tuple[Any, ...], int] = {}
+    group_values_map: Dict[Tuple[Any, ...], List[Any]] = {}
+    if group_by:
+        codes: List[int] = []
+        for group_values in zip(*(columns[col] for col in group_by)):
+            if all(_is_summary_empty(value) for value in group_values):
+                codes.append(-1)
+                continue
+            key = tuple(_summary_key_component(value) for value in group_values)
+            code = group_codes.get(key)
+            if code is None:
+                code = group_codes[key] = len(group_order)
+                group_values_map[key] = list(group_values)
+                group_order.append(key)
+            codes.append(code)
+    else:
+        codes = [0] * len(block)
+        group_order.append(())
+
+    group_count = max(1, len(group_order))
+    numeric_cols = {value_spec.col for value_spec in value_specs if value_spec.agg != "count"}
+    summaries = {col: _summary_column(columns[col], codes, col in numeric_cols)
+                 for col in {value_spec.col for value_spec in value_specs}}
+    results = [_summary_aggregate(value_spec.agg, group_count, summaries[value_spec.col])
+               for value_spec in value_specs]
 
     result_rows: List[List[Any]] = []
-    for key in group_order or [()]:
-        group_values = group_values_map.get(key, [])
-        accumulators = aggregates.get(key, [_SummaryAccumulator(spec.agg) for spec in value_specs])
-        row_values = list(group_values) + [acc.finalize() for acc in accumulators]
+    for index, key in enumerate(group_order or [()]):
+        row_values = list(group_values_map.get(key, [])) + [result[index] for result in results]
         result_rows.append(row_values)
 
     summary_table.cell_values = {
@@ -2151,19 +3101,14 @@ def col(table: Table, ref: str) -> np.ndarray:
     region, col_index = _parse_col_ref(ref)
     if region != "body":
         raise RangeParserError("col() supports body columns only")
-    values = [_cell_value(table, region, row, col_index) for row in range(table.grid_spec.bodyRows)]
+    rows = table.grid_spec.bodyRows
+    values = [row[0] for row in _region_block(table, region, 0, rows - 1, col_index, col_index)] if rows > 0 else []
     return np.array(values, dtype=object)
 
 
 def rng(table: Table, ref: str) -> np.ndarray:
     region, start_row, start_col, end_row, end_col = parse_range(_normalize_ref(ref))
-    values: List[List[Any]] = []
-    for row in range(start_row, end_row + 1):
-        row_values = []
-        for col_index in range(start_col, end_col + 1):
-            row_values.append(_cell_value(table, region, row, col_index))
-        values.append(row_values)
-    return np.array(values, dtype=object)
+    return np.array(_region_block(table, region, start_row, end_row, start_col, end_col), dtype=object)
 
 
 def _coerce_range_values(values: Any, rows: int, cols: int) -> List[List[Any]]:
@@ -2215,7 +3160,7 @@ def clear_range(table: Table, ref: str) -> None:
     table.clear_range(normalized)
 
 
-@dataclass
+@dataclass(slots=True)
 class Sheet:
     id: str
     name: str
@@ -2231,9 +3176,312 @@ class Sheet:
         }
 
 
+def _reference_span(index: int, absolute: bool, span: int) -> Tuple[int, int]:
+    return (index, index) if absolute else (index, index + span)
+
+
+def _formula_reads(ast: Any, table_id: str, row_span: int, col_span: int) -> List[Tuple[str, str, float, float, float, float]]:
+    reads: List[Tuple[str, str, float, float, float, float]] = []
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        kind = type(node)
+        if kind is BinaryOpNode:
+            stack.append(node.left)
+            stack.append(node.right)
+        elif kind is UnaryOpNode:
+            stack.append(node.operand)
+        elif kind is FuncCallNode:
+            stack.extend(node.args)
+        elif kind is CellRefNode or kind is RangeRefNode:
+            cells = (node.cell,) if kind is CellRefNode else (node.start, node.end)
+            rows = [row for cell in cells for row in _reference_span(cell.row, cell.row_abs, row_span)]
+            cols = [col for cell in cells for col in _reference_span(cell.col, cell.col_abs, col_span)]
+            reads.append((node.table_id or table_id, node.region, min(rows), max(rows), min(cols), max(cols)))
+        elif kind is ColumnRefNode:
+            reads.append((node.table_id or table_id, node.region, 0, math.inf, node.col, node.col))
+        elif kind is RowRefNode:
+            reads.append((node.table_id or table_id, node.region, node.row, node.row, 0, math.inf))
+    return reads
+
+
+def _anchor_axis(first: int, first_abs: bool, second: int, second_abs: bool,
+                 span: int) -> Tuple[int, int, bool]:
+    if first_abs == second_abs:
+        return min(first, second), max(first, second), not first_abs
+    first_lo, first_hi = _reference_span(first, first_abs, span)
+    second_lo, second_hi = _reference_span(second, second_abs, span)
+    return min(first_lo, second_lo), max(first_hi, second_hi), False
+
+
+@lru_cache(maxsize=4096)
+def _formula_anchor_reads(formula: str, row_span: int, col_span: int) -> Tuple[Tuple[Any, ...], ...]:
+    try:
+        stack = [_parse_cached(formula)]
+    except FormulaError:
+        return ()
+    reads: List[Tuple[Any, ...]] = []
+    while stack:
+        node = stack.pop()
+        kind = type(node)
+        if kind is BinaryOpNode:
+            stack.append(node.left)
+            stack.append(node.right)
+        elif kind is UnaryOpNode:
+            stack.append(node.operand)
+        elif kind is FuncCallNode:
+            stack.extend(node.args)
+        elif kind is CellRefNode or kind is RangeRefNode:
+            first, second = (node.cell, node.cell) if kind is CellRefNode else (node.start, node.end)
+            rows = _anchor_axis(first.row, first.row_abs, second.row, second.row_abs, row_span)
+            cols = _anchor_axis(first.col, first.col_abs, second.col, second.col_abs, col_span)
+            reads.append((node.table_id, node.region, *rows, *cols))
+        elif kind is ColumnRefNode:
+            reads.append((node.table_id, node.region, 0, math.inf, False, node.col, node.col, False))
+        elif kind is RowRefNode:
+            reads.append((node.table_id, node.region, node.row, node.row, False, 0, math.inf, False))
+    return tuple(reads)
+
+
+def _formula_entry_access(kind: str, payload: Any) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+    if kind == "summary":
+        spec = payload.summary_spec
+        reads = [(spec.source_table_id, "body", 0, math.inf, 0, math.inf)]
+        return reads, [(payload.id, None, 0, math.inf, 0, math.inf)]
+    table, target_range, formula_payload = payload
+    try:
+        region, start_row, start_col, end_row, end_col = parse_range(_normalize_ref(target_range))
+    except RangeParserError:
+        return [], []
+    writes = [(table.id, region, start_row, end_row, start_col, end_col)]
+    formula = str(formula_payload.get("formula", "")).strip()
+    if not formula or formula_payload.get("mode", "spreadsheet") != "spreadsheet":
+        return [], writes
+    try:
+        ast = _parse_cached(formula)
+    except FormulaError:
+        return [], writes
+    return _formula_reads(ast, table.id, max(0, end_row - start_row), max(0, end_col - start_col)), writes
+
+
+def _accesses_overlap(write: Tuple[Any, ...], read: Tuple[Any, ...]) -> bool:
+    if write[0] != read[0] or (write[1] is not None and write[1] != read[1]):
+        return False
+    return write[2] <= read[3] and read[2] <= write[3] and write[4] <= read[5] and read[4] <= write[5]
+
+
+def _access_buckets(access: Tuple[Any, ...]) -> Iterable[int]:
+    first = int(access[2]) // _ORDER_BUCKET_ROWS
+    if access[3] == math.inf or int(access[3]) // _ORDER_BUCKET_ROWS - first > _ORDER_BUCKET_SPAN:
+        return (-1,)
+    return range(first, int(access[3]) // _ORDER_BUCKET_ROWS + 1)
+
+
+def _overlapping_writers(accesses: List[Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]]) -> List[set]:
+    later: List[set] = [set() for _ in accesses]
+    written: Dict[Tuple[Any, Any], Dict[int, List[Tuple[int, Tuple[Any, ...]]]]] = {}
+    table_writers: Dict[Any, List[int]] = {}
+    whole_tables: Dict[Any, List[int]] = {}
+    for writer, (_, writes) in enumerate(accesses):
+        for write in writes:
+            table_writers.setdefault(write[0], []).append(writer)
+            if write[1] is None:
+                whole_tables.setdefault(write[0], []).append(writer)
+                continue
+            buckets = written.setdefault((write[0], write[1]), {})
+            keys = _access_buckets(write)
+            for key in (buckets.keys() if keys == (-1,) else (-1, *keys)):
+                for other, previous in buckets.get(key, ()):
+                    if other != writer and _accesses_overlap(write, previous):
+                        later[other].add(writer)
+            for key in keys:
+                buckets.setdefault(key, []).append((writer, write))
+    for table_id, whole in whole_tables.items():
+        for writer in whole:
+            for other in table_writers[table_id]:
+                if other < writer:
+                    later[other].add(writer)
+                elif other > writer:
+                    later[writer].add(other)
+    return later
+
+
+def _formula_evaluation_order(
+    entries: List[Tuple[int, str, Any]],
+) -> List[Tuple[Tuple[int, str, Any], Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]], bool, bool]]:
+    accesses = [_formula_entry_access(kind, payload) for _, kind, payload in entries]
+    readers: Dict[Any, Dict[Any, Dict[int, List[Tuple[int, Tuple[Any, ...]]]]]] = {}
+    for reader, (reads, _) in enumerate(accesses):
+        for read in reads:
+            regions = readers.setdefault(read[0], {}).setdefault(read[1], {})
+            for bucket in _access_buckets(read):
+                regions.setdefault(bucket, []).append((reader, read))
+    dependents: List[List[int]] = [[] for _ in entries]
+    pending = [0] * len(entries)
+    self_reading = [False] * len(entries)
+    overwriters = _overlapping_writers(accesses)
+    exclusive = [True] * len(entries)
+    for writer, later in enumerate(overwriters):
+        for other in later:
+            exclusive[writer] = exclusive[other] = False
+    for writer, (_, writes) in enumerate(accesses):
+        found = set(overwriters[writer])
+        for write in writes:
+            regions = readers.get(write[0], {})
+            for region in (regions if write[1] is None else (write[1],)):
+                buckets = regions.get(region)
+                if not buckets:
+                    continue
+                keys = _access_buckets(write)
+                keys = buckets.keys() if keys == (-1,) else (-1, *keys)
+                for key in keys:
+                    for reader, read in buckets.get(key, ()):
+                        if reader not in found and _accesses_overlap(write, read):
+                            found.add(reader)
+        if writer in found:
+            found.discard(writer)
+            self_reading[writer] = True
+        for reader in found:
+            dependents[writer].append(reader)
+            pending[reader] += 1
+    ready = [index for index, count in enumerate(pending) if not count]
+    heapq.heapify(ready)
+    done = [False] * len(entries)
+    positions: List[int] = []
+    while len(positions) < len(entries):
+        if not ready:
+            ready.append(done.index(False))
+        index = heapq.heappop(ready)
+        if done[index]:
+            continue
+        done[index] = True
+        positions.append(index)
+        for reader in dependents[index]:
+            pending[reader] -= 1
+            if not pending[reader] and not done[reader]:
+                heapq.heappush(ready, reader)
+    rank = {index: position for position, index in enumerate(positions)}
+    return [
+        (
+            entries[index],
+            accesses[index],
+            self_reading[index] or any(rank[reader] < rank[index] for reader in dependents[index]),
+            exclusive[index],
+        )
+        for index in positions
+    ]
+
+
+class _ChangedCells:
+    def __init__(self) -> None:
+        self.tables: set = set()
+        self.cells: Dict[Any, Dict[Any, Dict[int, List[Tuple[int, int]]]]] = {}
+
+    def invalidate(self, table_id: str) -> None:
+        self.tables.add(table_id)
+
+    def add(self, table_id: str, keys: Iterable[Any]) -> None:
+        if table_id in self.tables:
+            return
+        regions = self.cells.setdefault(table_id, {})
+        for key in keys:
+            parsed = _parse_cell_key(key) if isinstance(key, str) else None
+            if parsed is None:
+                self.tables.add(table_id)
+                return
+            region, row, col = parsed
+            regions.setdefault(region, {}).setdefault(row // _ORDER_BUCKET_ROWS, []).append((row, col))
+
+    def within(self, access: Tuple[Any, ...]) -> Optional[List[Tuple[int, int]]]:
+        table_id = access[0]
+        if table_id in self.tables:
+            return None
+        found: List[Tuple[int, int]] = []
+        regions = self.cells.get(table_id)
+        if not regions:
+            return found
+        _, region, row_start, row_end, col_start, col_end = access
+        for name in (regions if region is None else (region,)):
+            buckets = regions.get(name)
+            if not buckets:
+                continue
+            keys = _access_buckets(access)
+            for bucket in (buckets.keys() if keys == (-1,) else keys):
+                for row, col in buckets.get(bucket, ()):
+                    if row_start <= row <= row_end and col_start <= col <= col_end:
+                        found.append((row, col))
+        return found
+
+    def touches(self, accesses: List[Tuple[Any, ...]]) -> bool:
+        for access in accesses:
+            table_id = access[0]
+            if table_id in self.tables:
+                return True
+            regions = self.cells.get(table_id)
+            if not regions:
+                continue
+            _, region, row_start, row_end, col_start, col_end = access
+            for name in (regions if region is None else (region,)):
+                buckets = regions.get(name)
+                if not buckets:
+                    continue
+                keys = _access_buckets(access)
+                for bucket in (buckets.keys() if keys == (-1,) else keys):
+                    for row, col in buckets.get(bucket, ()):
+                        if row_start <= row <= row_end and col_start <= col <= col_end:
+                            return True
+        return False
+
+
+def _formula_fill_offsets(changed: _ChangedCells, table: "Table", target_range: str,
+                          payload: Dict[str, Any]) -> Optional[List[Tuple[int, int]]]:
+    formula = str(payload.get("formula", "")).strip()
+    if not formula or payload.get("mode", "spreadsheet") != "spreadsheet":
+        return None
+    try:
+        region, start_row, start_col, end_row, end_col = parse_range(_normalize_ref(target_range))
+    except RangeParserError:
+        return None
+    row_span = end_row - start_row
+    col_span = end_col - start_col
+    if row_span < 0 or col_span < 0:
+        return None
+    reads = (*_formula_anchor_reads(formula, row_span, col_span),
+             (table.id, region, start_row, start_row, True, start_col, start_col, True))
+    limit = (row_span + 1) * (col_span + 1)
+    area = 0
+    spans: List[Tuple[int, int, int, int]] = []
+    for table_id, read_region, row_lo, row_hi, row_rel, col_lo, col_hi, col_rel in reads:
+        cells = changed.within((table_id or table.id, read_region,
+                                row_lo, row_hi + row_span if row_rel else row_hi,
+                                col_lo, col_hi + col_span if col_rel else col_hi))
+        if cells is None:
+            return None
+        for row, col in cells:
+            row_first, row_last = (max(0, row - row_hi), min(row_span, row - row_lo)) if row_rel else (0, row_span)
+            col_first, col_last = (max(0, col - col_hi), min(col_span, col - col_lo)) if col_rel else (0, col_span)
+            if row_first > row_last or col_first > col_last:
+                continue
+            area += (row_last - row_first + 1) * (col_last - col_first + 1)
+            if area >= limit:
+                return None
+            spans.append((row_first, row_last, col_first, col_last))
+    return sorted({
+        (row, col)
+        for row_first, row_last, col_first, col_last in spans
+        for row in range(row_first, row_last + 1)
+        for col in range(col_first, col_last + 1)
+    })
+
+
 class Project:
     def __init__(self) -> None:
         self.sheets: List[Sheet] = []
+        self._formula_order_cache: Optional[Tuple[Tuple[Any, ...], List[Any]]] = None
+        self._recalc_tables: Dict[str, Tuple[Any, ...]] = {}
+        self._recalc_formulas: Dict[Tuple[str, Optional[str]], Tuple[Tuple[Any, ...], List[Any]]] = {}
+        self._recalc_carry: List[Tuple[str, Optional[List[Any]]]] = []
+        self._table_index: Optional[Dict[str, Table]] = None
 
     def add_sheet(self, name: str, sheet_id: str) -> Sheet:
         if self._find_sheet(sheet_id) is not None:
@@ -2381,6 +3629,9 @@ class Project:
         return Rect(float(x), float(y), float(chart_width), float(chart_height))
 
     def table(self, table_id: str) -> Table:
+        index = self._table_index
+        if index is not None and table_id in index:
+            return index[table_id]
         for sheet in self.sheets:
             for table in sheet.tables:
                 if table.id == table_id:
@@ -2411,12 +3662,108 @@ class Project:
                         table.formula_order[target_range] = order
                     entries.append((order, "formula", (table, target_range, payload)))
         entries.sort(key=lambda entry: entry[0])
-        for _, kind, payload in entries:
+        signature = tuple(
+            (order, id(payload), payload.summary_spec.source_table_id) if kind == "summary"
+            else (order, id(payload[0]), payload[0].id, payload[1], payload[2].get("formula"), payload[2].get("mode"))
+            for order, kind, payload in entries
+        )
+        cached = self._formula_order_cache
+        if cached is not None and cached[0] == signature:
+            plan = cached[1]
+        else:
+            plan = _formula_evaluation_order(entries)
+            self._formula_order_cache = (signature, plan)
+
+        tables: Dict[str, Table] = {}
+        for sheet in self.sheets:
+            for table in sheet.tables:
+                tables.setdefault(table.id, table)
+        self._table_index = tables
+        try:
+            self._recalculate(plan, tables)
+        finally:
+            self._table_index = None
+
+    def _recalculate(self, plan: List[Any], tables: Dict[str, Table]) -> None:
+        changed = _ChangedCells()
+        for table_id, keys in self._recalc_carry:
+            if keys is None:
+                changed.invalidate(table_id)
+            else:
+                changed.add(table_id, keys)
+        logged: Dict[str, Tuple[Any, int]] = {}
+        for table_id, table in tables.items():
+            cell_values = table.cell_values
+            previous = self._recalc_tables.get(table_id)
+            changes = getattr(cell_values, "_changes", None)
+            if (previous is None or changes is None or previous[0] is not table or previous[1] is not cell_values
+                    or previous[2] != (table.grid_spec.bodyRows, table.grid_spec.bodyCols)):
+                changed.invalidate(table_id)
+            else:
+                changed.add(table_id, changes)
+            if isinstance(cell_values, _CellValues):
+                cell_values._changes = []
+                logged[table_id] = (cell_values, 0)
+
+        evaluated = self._recalc_formulas
+        current: Dict[Tuple[str, Optional[str]], Tuple[Tuple[Any, ...], List[Any]]] = {}
+        states: List[Tuple[Tuple[str, Optional[str]], Tuple[Any, ...]]] = []
+        for (order, kind, payload), (_, writes), _, _ in plan:
             if kind == "summary":
-                _apply_summary_table(self, payload)
-                continue
-            table, target_range, formula_payload = payload
-            table.apply_formula_entry(self, target_range, formula_payload)
+                spec = payload.summary_spec
+                key = (payload.id, None)
+                state = (order, spec.source_table_id, spec.source_range, tuple(spec.group_by),
+                         tuple((value.col, value.agg) for value in spec.values))
+            else:
+                key = (payload[0].id, payload[1])
+                state = (order, payload[2].get("formula"), payload[2].get("mode"))
+            states.append((key, state))
+            current[key] = (state, writes)
+        dropped = [write for key, (state, writes) in evaluated.items()
+                   if current.get(key, (None,))[0] != state for write in writes]
+        reshuffled = bool(dropped) or any(key not in evaluated for key in current)
+        carry: List[Tuple[str, Optional[List[Any]]]] = []
+        for ((order, kind, payload), (reads, writes), feedback, exclusive), (key, state) in zip(plan, states):
+            if kind == "summary":
+                table = payload
+            else:
+                table, target_range, formula_payload = payload
+            offsets = None
+            if (evaluated.get(key, (None,))[0] == state and all(access[0] in tables for access in reads)
+                    and (exclusive or not reshuffled)
+                    and not any(_accesses_overlap(old, write) for old in dropped for write in writes)):
+                if not changed.touches(reads) and not changed.touches(writes):
+                    continue
+                if kind != "summary" and exclusive and not feedback:
+                    offsets = _formula_fill_offsets(changed, table, target_range, formula_payload)
+            if kind == "summary":
+                _apply_summary_table(self, table)
+            else:
+                table.apply_formula_entry(self, target_range, formula_payload, offsets)
+            cell_values, position = logged.get(table.id, (None, 0))
+            changes = getattr(table.cell_values, "_changes", None)
+            if cell_values is not table.cell_values or changes is None:
+                keys = None
+                changed.invalidate(table.id)
+                if isinstance(table.cell_values, _CellValues):
+                    table.cell_values._changes = []
+                    logged[table.id] = (table.cell_values, 0)
+            else:
+                keys = changes[position:]
+                changed.add(table.id, keys)
+                logged[table.id] = (cell_values, len(changes))
+            if feedback and keys != []:
+                carry.append((table.id, keys))
+
+        for cell_values, _ in logged.values():
+            if cell_values._changes is not None:
+                cell_values._changes = []
+        self._recalc_carry = carry
+        self._recalc_formulas = current
+        self._recalc_tables = {
+            table_id: (table, table.cell_values, (table.grid_spec.bodyRows, table.grid_spec.bodyCols))
+            for table_id, table in tables.items()
+        }
 
     def to_dict(self) -> Dict[str, Any]:
         return {"sheets": [sheet.to_dict() for sheet in self.sheets]}
@@ -2447,7 +3794,8 @@ def export_numpy_script(project: Project,
                         include_formulas: bool = False) -> str:
     if include_formulas:
         return _export_numpy_script_with_formulas(project, include_labels)
-    lines: List[str] = ["import numpy as np", "", "def build_tables():", "    tables = {}"]
+    lines: List[str] = ["import base64", "import numpy as np", "", "def build_tables():", "    tables = {}"]
+    emitted_arrays: Dict[Tuple[int, int, bytes], str] = {}
     for sheet in project.sheets:
         for table in sheet.tables:
             body_rows = table.grid_spec.bodyRows
@@ -2455,7 +3803,17 @@ def export_numpy_script(project: Project,
             body_values = _collect_region_values(table, "body", body_rows, body_cols)
             body_values, body_dtype = _coerce_numpy_values(body_values)
             body_var = _safe_identifier(f"{table.id}_body")
-            lines.extend(_emit_np_array(body_var, body_values, body_dtype))
+            if body_dtype == "float":
+                packed = _pack_float_values(body_values)
+                array_key = (body_rows, body_cols, packed)
+                shared_var = emitted_arrays.get(array_key)
+                if shared_var is not None:
+                    lines.append(f"    {body_var} = {shared_var}.copy()")
+                else:
+                    emitted_arrays[array_key] = body_var
+                    lines.extend(_emit_np_array(body_var, body_values, body_dtype, packed))
+            else:
+                lines.extend(_emit_np_array(body_var, body_values, body_dtype))
 
             entry_parts = [f"'body': {body_var}"]
             if include_labels:
@@ -2563,7 +3921,7 @@ def _format_python_literal(value: Any) -> str:
         return repr(value)
     if isinstance(value, str):
         return _encode_py_string(value)
-    return pformat(value, width=88)
+    return _PRETTY_PRINTER.pformat(value)
 
 
 def _collect_cell_values(table: Table, include_labels: bool, formula_targets: set[str]) -> Dict[str, Any]:
@@ -2694,19 +4052,14 @@ def _emit_export_helpers(include_labels: bool, include_formulas: bool) -> List[s
         "    return values",
         "",
         "def _coerce_numpy_values(values):",
-        "    flat = []",
-        "    for row in values:",
-        "        flat.extend(row)",
-        "",
-        "    def is_number(item):",
-        "        return isinstance(item, (int, float, np.number)) and not isinstance(item, bool)",
-        "",
-        "    if all((item is None) or is_number(item) for item in flat):",
-        "        coerced = []",
-        "        for row in values:",
-        "            coerced.append([None if item is None else float(item) for item in row])",
-        "        return coerced, 'float'",
-        "    return values, 'object'",
+        "    kinds = {type(item) for row in values for item in row}",
+        "    kinds.discard(type(None))",
+        "    for kind in kinds:",
+        "        if not issubclass(kind, (int, float, np.number)) or issubclass(kind, bool):",
+        "            return values, 'object'",
+        "    if kinds <= {float}:",
+        "        return values, 'float'",
+        "    return [[None if item is None else float(item) for item in row] for row in values], 'float'",
         "",
         "def _collect_label_bands(table):",
         "    labels = {}",
@@ -2725,8 +4078,9 @@ def _emit_export_helpers(include_labels: bool, include_formulas: bool) -> List[s
     return lines
 
 
+@lru_cache(maxsize=8192)
 def _safe_identifier(name: str) -> str:
-    cleaned = re.sub(r"[^A-Za-z0-9_]", "_", name)
+    cleaned = _UNSAFE_IDENTIFIER_RE.sub("_", name)
     if not cleaned:
         return "table"
     if cleaned[0].isdigit():
@@ -2734,24 +4088,25 @@ def _safe_identifier(name: str) -> str:
     return cleaned
 
 
+@lru_cache(maxsize=8192)
 def _encode_py_string(value: str) -> str:
     escaped = value.replace("\\", "\\\\").replace("'", "\\'")
     return f"'{escaped}'"
 
 
 def _collect_region_values(table: Table, region: str, rows: int, cols: int) -> List[List[Any]]:
-    values: List[List[Any]] = []
-    for row in range(rows):
-        row_values: List[Any] = []
-        for col in range(cols):
-            key = address(region, row, col)
-            row_values.append(_normalize_export_value(table.cell_values.get(key)))
-        values.append(row_values)
-    return values
+    if rows <= 0:
+        return []
+    block = _region_block(table, region, 0, rows - 1, 0, cols - 1)
+    plain = _PLAIN_EXPORT_TYPES
+    return [[value if type(value) in plain else _normalize_export_value(value) for value in row]
+            for row in block]
+
+
+_PLAIN_EXPORT_TYPES = frozenset((type(None), bool, int, float, str))
 
 
 def _normalize_export_value(value: Any) -> Any:
-    value = _unwrap_value(value)
     if isinstance(value, datetime.datetime):
         return value.isoformat()
     if isinstance(value, datetime.date):
@@ -2765,19 +4120,22 @@ def _normalize_export_value(value: Any) -> Any:
 
 
 def _coerce_numpy_values(values: List[List[Any]]) -> Tuple[List[List[Any]], str]:
-    flat: List[Any] = []
-    for row in values:
-        flat.extend(row)
+    kinds = {type(item) for row in values for item in row}
+    if not all(_is_float_kind(kind) for kind in kinds):
+        return values, "object"
+    if kinds <= _FLOAT_KINDS:
+        return values, "float"
+    return [[None if item is None else float(item) for item in row] for row in values], "float"
+
+
+_FLOAT_KINDS = frozenset((type(None), float))
 
-    def is_number(item: Any) -> bool:
-        return isinstance(item, (int, float, np.number)) and not isinstance(item, bool)
 
-    if all((item is None) or is_number(item) for item in flat):
-        coerced: List[List[Any]] = []
-        for row in values:
-            coerced.append([None if item is None else float(item) for item in row])
-        return coerced, "float"
-    return values, "object"
+@lru_cache(maxsize=None)
+def _is_float_kind(kind: type) -> bool:
+    if kind is type(None):
+        return True
+    return issubclass(kind, (int, float, np.number)) and not issubclass(kind, bool)
 
 
 def _collect_label_bands(table: Table) -> Dict[str, List[List[Any]]]:
@@ -2794,31 +4152,71 @@ def _collect_label_bands(table: Table) -> Dict[str, List[List[Any]]]:
     return labels
 
 
-def _emit_np_array(var_name: str, values: List[List[Any]], dtype: str) -> List[str]:
-    literal = pformat(values, width=88)
+def _pack_float_values(values: List[List[Any]]) -> bytes:
+    flat = [math.nan if item is None else item for row in values for item in row]
+    return struct.pack(f"<{len(flat)}d", *flat)
+
+
+def _emit_np_array(var_name: str,
+                   values: List[List[Any]],
+                   dtype: str,
+                   packed: Optional[bytes] = None) -> List[str]:
+    rows = len(values)
+    cols = len(values[0]) if rows else 0
+    if dtype == "float" and rows * cols > _BASE64_ARRAY_THRESHOLD:
+        if packed is None:
+            packed = _pack_float_values(values)
+        encoded = base64.b64encode(packed).decode("ascii")
+        return [
+            f"    {var_name} = np.frombuffer(base64.b64decode({encoded!r}), "
+            f"dtype='<f8').reshape(({rows}, {cols})).copy()"
+        ]
+    if rows * cols > _BASE64_ARRAY_THRESHOLD:
+        lines = [f"    {var_name} = np.array(["]
+        lines.extend([f"        {row!r}," for row in values])
+        lines.append(f"    ], dtype={dtype})")
+        return lines
+    literal = _format_rows_literal(values)
     if "\n" not in literal:
         return [f"    {var_name} = np.array({literal}, dtype={dtype})"]
     lines = [f"    {var_name} = np.array("]
-    for line in literal.splitlines():
-        lines.append(f"        {line}")
+    lines.extend([f"        {line}" for line in literal.splitlines()])
     lines.append(f"    , dtype={dtype})")
     return lines
 
 
+def _format_rows_literal(values: List[List[Any]]) -> str:
+    literal = repr(values)
+    if "\n" in literal:
+        return _PRETTY_PRINTER.pformat(values)
+    if len(literal) <= _PRETTY_WIDTH:
+        return literal
+    rows: List[str] = []
+    for row in values:
+        text = repr(row)
+        if len(text) > _PRETTY_WIDTH - 2:
+            items = [repr(item) for item in row]
+            for index, item in enumerate(items):
+                limit = _PRETTY_WIDTH - (4 if index == len(items) - 1 else 3)
+                if len(item) > limit and type(row[index]) not in _PRETTY_ATOMS:
+                    return _PRETTY_PRINTER.pformat(values)
+            text = "[" + ",\n  ".join(items) + "]"
+        rows.append(text)
+    return "[" + ",\n ".join(rows) + "]"
+
+
+_PRETTY_ATOMS = frozenset((type(None), bool, int, float))
+
+
 def _emit_literal_assignment(var_name: str, value: Any) -> List[str]:
-    literal = pformat(value, width=88)
-    lines: List[str] = []
-    parts = literal.splitlines()
-    if len(parts) == 1:
-        lines.append(f"    {var_name} = {parts[0]}")
-        return lines
-    lines.append(f"    {var_name} = {parts[0]}")
-    for line in parts[1:]:
-        lines.append(f"    {line}")
+    first, *rest = _PRETTY_PRINTER.pformat(value).splitlines()
+    lines = [f"    {var_name} = {first}"]
+    if rest:
+        lines.extend([f"    {line}" for line in rest])
     return lines
 
 
-__all__ = [
+__all__ = (
     "Project",
     "Table",
     "Chart",
@@ -2892,4 +4290,4 @@ __all__ = [
     "parse_range",
     "column_label",
     "column_index",
-]
+)
@@ -2,17 +2,32 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
+import os
 import sys
 import traceback
+from functools import lru_cache
+from types import CodeType
 
 from canvassheets_api import FormulaLocals, Project, export_numpy_script
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def run_script(path: str) -> Project:
-    globals_dict = FormulaLocals({"__file__": path, "__name__": "__main__", "__builtins__": __builtins__})
+
+@lru_cache(maxsize=128)
+def _compile_script(path: str, mtime_ns: int, size: int) -> CodeType:
     with open(path, "r", encoding="utf-8") as handle:
         source = handle.read()
-    exec(compile(source, path, "exec"), globals_dict, globals_dict)
+    return compile(source, path, "exec")
+
+
+def run_script(path: str) -> Project:
+    globals_dict = FormulaLocals({"__file__": path, "__name__": "__main__", "__builtins__": __builtins__})
+    stat = os.stat(path)
+    exec(_compile_script(path, stat.st_mtime_ns, stat.st_size), globals_dict, globals_dict)
     proj = globals_dict.get("proj")
     if not isinstance(proj, Project):
         raise RuntimeError("Script must define `proj = Project()`")
@@ -20,6 +35,44 @@ def run_script(path: str) -> Project:
     return proj
 
 
+def _has_non_finite(payload: object) -> bool:
+    pending = [payload]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def _encode_json(payload: object) -> bytes:
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+        else:
+            if b"null" not in encoded or not _has_non_finite(payload):
+                return encoded
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _write_project_json(project: Project) -> None:
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    out.write(b'{"sheets":[')
+    for index, sheet in enumerate(project.sheets):
+        if index:
+            out.write(b",")
+        out.write(_encode_json(sheet.to_dict()))
+    out.write(b"]}\n")
+    out.flush()
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run a CanvasSheets script and emit project JSON.")
     parser.add_argument("script", help="Path to the Python script to run.")
@@ -40,8 +93,7 @@ def main() -> int:
         print(export_script)
         return 0
 
-    payload = project.to_dict()
-    print(json.dumps(payload, sort_keys=True, separators=(",", ":")))
+    _write_project_json(project)
     return 0
 
 
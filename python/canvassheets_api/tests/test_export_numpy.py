@@ -37,3 +37,59 @@ def test_export_numpy_script_builds_tables():
     assert tables["table_1"]["labels"]["top"][0][0] == "Header"
     assert tables["table_1"]["labels"]["left"][0][0] == "Row1"
     assert "body[A1]" in tables["table_1"]["formulas"]
+
+
+def test_export_numpy_script_encodes_large_arrays():
+    project = Project()
+    project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    table = project.add_table("sheet_1", table_id="table_1", name="table_1", rows=20, cols=20)
+    table.set_range("body[A0:T19]", [[row * 20 + col for col in range(20)] for row in range(20)])
+    table.set_cells({"body[C3]": None})
+
+    script = export_numpy_script(project)
+    assert "np.frombuffer(base64.b64decode(" in script
+    globals_dict: dict[str, object] = {"__builtins__": __builtins__}
+    exec(script, globals_dict, globals_dict)
+
+    body = globals_dict["tables"]["table_1"]["body"]
+    expected = np.arange(400, dtype=float).reshape((20, 20))
+    expected[3, 2] = np.nan
+    assert body.shape == (20, 20)
+    assert np.allclose(body, expected, equal_nan=True)
+    body[0, 0] = -1.0
+
+
+def test_export_numpy_script_reuses_identical_arrays():
+    project = Project()
+    project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    for table_id in ("table_1", "table_2"):
+        table = project.add_table("sheet_1", table_id=table_id, name=table_id, rows=2, cols=2)
+        table.set_range("body[A0:B1]", [[1, 2], [3, None]])
+
+    script = export_numpy_script(project)
+    assert script.count("np.array(") == 1
+    assert "table_2_body = table_1_body.copy()" in script
+    globals_dict: dict[str, object] = {"__builtins__": __builtins__}
+    exec(script, globals_dict, globals_dict)
+
+    tables = globals_dict["tables"]
+    assert np.allclose(tables["table_2"]["body"], tables["table_1"]["body"], equal_nan=True)
+    assert tables["table_2"]["body"] is not tables["table_1"]["body"]
+
+
+def test_export_numpy_script_writes_large_object_arrays_by_row():
+    project = Project()
+    project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    table = project.add_table("sheet_1", table_id="table_1", name="table_1", rows=30, cols=10)
+    rows = [[f"r{row}" if col == 0 else row * col for col in range(10)] for row in range(30)]
+    table.set_range("body[A0:J29]", rows)
+
+    script = export_numpy_script(project)
+    assert "        ['r5', 5, 10, 15, 20, 25, 30, 35, 40, 45]," in script
+    globals_dict: dict[str, object] = {"__builtins__": __builtins__}
+    exec(script, globals_dict, globals_dict)
+
+    body = globals_dict["tables"]["table_1"]["body"]
+    assert body.shape == (30, 10)
+    assert body[5][0] == "r5"
+    assert body[29][9] == 29 * 9
@@ -5,6 +5,7 @@ import math
 import pytest
 
 from canvassheets_api import (
+    FormulaExpr,
     FormulaLocals,
     Project,
     Rect,
@@ -38,66 +39,85 @@ from canvassheets_api import (
 )
 
 
-def test_formula_assignment_sugar():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
+_BASE_GLOBALS = {
+    "__builtins__": __builtins__,
+    "Rect": Rect,
+    "formula": formula,
+    "table_context": table_context,
+    "label_context": label_context,
+    "c_range": c_range,
+    "c_sum": c_sum,
+    "c_avg": c_avg,
+    "c_min": c_min,
+    "c_max": c_max,
+    "c_count": c_count,
+    "c_counta": c_counta,
+    "c_if": c_if,
+    "c_and": c_and,
+    "c_or": c_or,
+    "c_not": c_not,
+    "c_pmt": c_pmt,
+    "c_abs": c_abs,
+    "c_round": c_round,
+    "c_floor": c_floor,
+    "c_ceil": c_ceil,
+    "c_sqrt": c_sqrt,
+    "c_pow": c_pow,
+    "c_log": c_log,
+    "c_log10": c_log10,
+    "c_exp": c_exp,
+    "c_sin": c_sin,
+    "c_cos": c_cos,
+    "c_tan": c_tan,
+}
+
+
+def _exec_script(source: str) -> Project:
+    globals_dict = FormulaLocals(_BASE_GLOBALS)
     globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-    globals_dict["c_sum"] = c_sum
+    exec(source, globals_dict, globals_dict)
+    return globals_dict["proj"]
+
 
-    exec(
+def test_formula_assignment_sugar():
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=3, cols=3)\n"
         "t.set_cells({'body[A0]': 1, 'body[A1]': 2})\n"
         "with table_context(t):\n"
-        "    b0 = a0 + a1\n",
-        globals_dict,
-        globals_dict,
+        "    b0 = a0 + a1\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table = proj.table("table_1")
     assert table.cell_values["body[B0]"] == 3
 
 
-def test_range_sum_sugar():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-    globals_dict["c_sum"] = c_sum
+def test_formula_expressions_keep_operands_at_build_time():
+    a = FormulaExpr("A1")
+    b = a + 1
+    c = b * 2
+    a.expr = "B2"
+    b.expr = "C3"
+    assert b.expr == "C3"
+    assert c.expr == "A1+1*2"
+    assert (-a + c).expr == "-B2+A1+1*2"
 
-    exec(
+
+def test_range_sum_sugar():
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=3, cols=3)\n"
         "t.set_cells({'body[A0]': 1, 'body[A1]': 2, 'body[B0]': 3})\n"
         "with table_context(t):\n"
-        "    c0 = c_sum('A0:B1')\n",
-        globals_dict,
-        globals_dict,
+        "    c0 = c_sum('A0:B1')\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table = proj.table("table_1")
     assert table.cell_values["body[C0]"] == 6
 
 
 def test_formula_helper_aggregates():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-    globals_dict["c_range"] = c_range
-    globals_dict["c_sum"] = c_sum
-    globals_dict["c_avg"] = c_avg
-    globals_dict["c_min"] = c_min
-    globals_dict["c_max"] = c_max
-    globals_dict["c_count"] = c_count
-    globals_dict["c_counta"] = c_counta
-
-    exec(
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=4, cols=4)\n"
         "t.set_cells({'body[A0]': 1, 'body[A1]': 2, 'body[A2]': 3, 'body[B0]': 'text', "
@@ -108,12 +128,8 @@ def test_formula_helper_aggregates():
         "    c2 = c_max('A0:A2')\n"
         "    c3 = c_sum(c_range('A0:A2'))\n"
         "    c4 = c_count('A0:B2')\n"
-        "    c5 = c_counta('A0:B2')\n",
-        globals_dict,
-        globals_dict,
+        "    c5 = c_counta('A0:B2')\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table = proj.table("table_1")
     assert table.cell_values["body[C0]"] == 2.0
@@ -124,17 +140,32 @@ def test_formula_helper_aggregates():
     assert table.cell_values["body[C5]"] == 4
 
 
+def test_formula_helper_aggregates_over_large_ranges():
+    proj = _exec_script(
+        "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
+        "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=40, cols=4)\n"
+        "t.set_range('body[A0:B39]', [[row, 'text' if row % 4 else ''] for row in range(40)])\n"
+        "with table_context(t):\n"
+        "    c0 = c_avg('A0:B39')\n"
+        "    c1 = c_count('A0:B39')\n"
+        "    c2 = c_counta('A0:B39')\n"
+        "    c3 = c_max('A0:A39')\n"
+    )
+    proj.apply_formulas()
+    table = proj.table("table_1")
+    assert table.cell_values["body[C0]"] == 19.5
+    assert table.cell_values["body[C1]"] == 40
+    assert table.cell_values["body[C2]"] == 70
+    assert table.cell_values["body[C3]"] == 39
+
+    table.set_cells({"body[B0]": "note", "body[A39]": None})
+    proj.apply_formulas()
+    assert table.cell_values["body[C1]"] == 39
+    assert table.cell_values["body[C2]"] == 70
+
+
 def test_formula_helper_logical():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-    globals_dict["c_if"] = c_if
-    globals_dict["c_and"] = c_and
-    globals_dict["c_or"] = c_or
-    globals_dict["c_not"] = c_not
-
-    exec(
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=3, cols=3)\n"
         "t.set_cells({'body[A0]': 1, 'body[A1]': 0})\n"
@@ -142,12 +173,8 @@ def test_formula_helper_logical():
         "    b0 = c_and(a0, a1)\n"
         "    b1 = c_or(a0, a1)\n"
         "    b2 = c_not(a1)\n"
-        "    b3 = c_if(c_and(a0, a1), 10, 20)\n",
-        globals_dict,
-        globals_dict,
+        "    b3 = c_if(c_and(a0, a1), 10, 20)\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table = proj.table("table_1")
     assert table.cell_values["body[B0]"] is False
@@ -157,25 +184,7 @@ def test_formula_helper_logical():
 
 
 def test_formula_helper_math():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-    globals_dict["c_pmt"] = c_pmt
-    globals_dict["c_abs"] = c_abs
-    globals_dict["c_round"] = c_round
-    globals_dict["c_floor"] = c_floor
-    globals_dict["c_ceil"] = c_ceil
-    globals_dict["c_sqrt"] = c_sqrt
-    globals_dict["c_pow"] = c_pow
-    globals_dict["c_log"] = c_log
-    globals_dict["c_log10"] = c_log10
-    globals_dict["c_exp"] = c_exp
-    globals_dict["c_sin"] = c_sin
-    globals_dict["c_cos"] = c_cos
-    globals_dict["c_tan"] = c_tan
-
-    exec(
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), "
         "rows=13, cols=2)\n"
@@ -192,12 +201,8 @@ def test_formula_helper_math():
         "    b9 = c_sin(0)\n"
         "    b10 = c_cos(0)\n"
         "    b11 = c_tan(0)\n"
-        "    b12 = c_pmt(0.1, 2, 100)\n",
-        globals_dict,
-        globals_dict,
+        "    b12 = c_pmt(0.1, 2, 100)\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table = proj.table("table_1")
     assert table.cell_values["body[B0]"] == 5
@@ -216,79 +221,44 @@ def test_formula_helper_math():
 
 
 def test_table_indexing_sugar():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-
-    exec(
-        "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
-        "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=2, cols=2)\n"
-        "with table_context(t):\n"
-        "    t[0, 0] = 1\n"
-        "    t[0, 1] = t[0, 0] + 2\n",
-        globals_dict,
-        globals_dict,
-    )
-
-    proj = globals_dict["proj"]
+    proj = Project()
+    proj.add_sheet("Sheet 1", sheet_id="sheet_1")
+    t = proj.add_table("sheet_1", table_id="table_1", name="table_1", rect=Rect(0, 0, 10, 10), rows=2, cols=2)
+    with table_context(t):
+        t[0, 0] = 1
+        t[0, 1] = t[0, 0] + 2
     proj.apply_formulas()
     table = proj.table("table_1")
     assert table.cell_values["body[B0]"] == 3
 
 
 def test_label_assignment_sugar():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["label_context"] = label_context
-
-    exec(
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=3, cols=3)\n"
         "with label_context(t, 'top_labels'):\n"
-        "    a0 = 'Header'\n",
-        globals_dict,
-        globals_dict,
+        "    a0 = 'Header'\n"
     )
-
-    table = globals_dict["proj"].table("table_1")
+    table = proj.table("table_1")
     assert table.cell_values["top_labels[A0]"] == "Header"
 
 
 def test_label_formula_sugar():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-    globals_dict["c_sum"] = c_sum
-
-    exec(
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), "
         "rows=3, cols=3, labels={'top': 1, 'left': 0, 'bottom': 0, 'right': 0})\n"
         "t.set_cells({'body[A0]': 1, 'body[A1]': 2})\n"
         "with table_context(t):\n"
-        "    top_labels.a0 = c_sum('A0:A1')\n",
-        globals_dict,
-        globals_dict,
+        "    top_labels.a0 = c_sum('A0:A1')\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table = proj.table("table_1")
     assert table.cell_values["top_labels[A0]"] == 3
 
 
 def test_cross_table_formula_order():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-    globals_dict["c_sum"] = c_sum
-    globals_dict["formula"] = formula
-
-    exec(
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t1 = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=4, cols=3)\n"
         "with table_context(t1):\n"
@@ -302,12 +272,8 @@ def test_cross_table_formula_order():
         "    a0 = 2\n"
         "    c2 = formula('B2+A0+table_1.B2')\n"
         "with table_context(t1):\n"
-        "    b3 = formula('table_2.C2+table_2.B2+A0')\n",
-        globals_dict,
-        globals_dict,
+        "    b3 = formula('table_2.C2+table_2.B2+A0')\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table_1 = proj.table("table_1")
     table_2 = proj.table("table_2")
@@ -316,12 +282,7 @@ def test_cross_table_formula_order():
 
 
 def test_cross_table_attribute_sugar():
-    globals_dict = FormulaLocals({"__builtins__": __builtins__})
-    globals_dict["proj"] = Project()
-    globals_dict["Rect"] = Rect
-    globals_dict["table_context"] = table_context
-
-    exec(
+    proj = _exec_script(
         "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
         "t1 = proj.add_table('sheet_1', table_id='table_1', name='table_1', rect=Rect(0,0,10,10), rows=2, cols=2)\n"
         "t2 = proj.add_table('sheet_1', table_id='table_2', name='table_2', rect=Rect(0,0,10,10), rows=2, cols=2)\n"
@@ -329,12 +290,22 @@ def test_cross_table_attribute_sugar():
         "with table_context(t2):\n"
         "    b0 = 7\n"
         "with table_context(t1):\n"
-        "    a0 = table_2.b0\n",
-        globals_dict,
-        globals_dict,
+        "    a0 = table_2.b0\n"
     )
-
-    proj = globals_dict["proj"]
     proj.apply_formulas()
     table_1 = proj.table("table_1")
     assert table_1.cell_values["body[A0]"] == 7
+
+
+def test_formula_locals_follow_rebound_builtins():
+    globals_dict = FormulaLocals({"__builtins__": {"len": len, "abs": abs}, "abs": "mine"})
+    exec("size = len('abc')", globals_dict, globals_dict)
+    assert globals_dict["size"] == 3
+    assert globals_dict["abs"] == "mine"
+
+    globals_dict["__builtins__"] = {"max": max}
+    with pytest.raises(NameError):
+        exec("len('abc')", globals_dict, globals_dict)
+    exec("largest = max(1, 2)", globals_dict, globals_dict)
+    assert globals_dict["largest"] == 2
+    assert globals_dict["abs"] == "mine"
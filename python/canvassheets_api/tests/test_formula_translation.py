@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import math
+import warnings
 
 import pytest
 
-from canvassheets_api import Project, Rect
+from canvassheets_api import Project, Rect, cs_max, cs_min
+
+
+_RECT = Rect(0, 0, 100, 100)
 
 
 def _make_table(project: Project, table_id: str, rows: int = 5, cols: int = 5):
@@ -13,7 +17,7 @@ def _make_table(project: Project, table_id: str, rows: int = 5, cols: int = 5):
         "sheet_1",
         table_id=table_id,
         name=table_id,
-        rect=Rect(0, 0, 100, 100),
+        rect=_RECT,
         rows=rows,
         cols=cols,
         labels=None,
@@ -33,6 +37,59 @@ def test_sum_range_formula():
     assert table.cell_values["body[C0]"] == 6
 
 
+def test_sum_formula_is_exactly_rounded():
+    project = Project()
+    table = _make_table(project, "table_1", rows=10, cols=2)
+    table.set_range("body[A0:A9]", [[0.1]] * 10)
+    table.set_formula("body[B0]", "=SUM(A0:A9)")
+    table.set_formula("body[B1]", "=AVERAGE(A0:A9, 0.1)")
+    project.apply_formulas()
+    assert table.cell_values["body[B0]"] == 1.0
+    assert table.cell_values["body[B1]"] == 0.1
+
+
+def test_large_range_sums_are_exactly_rounded():
+    project = Project()
+    table = _make_table(project, "table_1", rows=100, cols=3)
+    table.set_range("body[A0:A99]", [[0.1]] * 100)
+    table.set_range("body[B0:B99]", [[1e308]] * 100)
+    table.set_formula("body[C0]", "=SUM(A0:A99)")
+    table.set_formula("body[C1]", "=AVERAGE(A0:A99)")
+    table.set_formula("body[C2]", "=SUM(B0:B99)")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        project.apply_formulas()
+    assert table.cell_values["body[C0]"] == 10.0
+    assert table.cell_values["body[C1]"] == 0.1
+    assert table.cell_values["body[C2]"] == math.inf
+
+
+def test_sum_over_no_numbers_is_integer_zero():
+    project = Project()
+    table = _make_table(project, "table_1", rows=100, cols=4)
+    table.set_cells({"body[A0]": "n/a"})
+    table.set_formula("body[D0]", "=SUM(A0:A3)")
+    table.set_formula("body[D1]", "=SUM(A0:C99)")
+    project.apply_formulas()
+    assert table.cell_values["body[D0]"] == 0
+    assert type(table.cell_values["body[D0]"]) is int
+    assert type(table.cell_values["body[D1]"]) is int
+
+
+def test_range_formula_sees_later_edits():
+    project = Project()
+    table = _make_table(project, "table_1", rows=3, cols=3)
+    table.set_range("body[A0:A2]", [[1], [2], [3]])
+    table.set_formula("body[C0]", "=SUM(A0:B3)")
+    project.apply_formulas()
+    assert table.cell_values["body[C0]"] == 6
+
+    table.set_cells({"body[A1]": {"type": "number", "value": 10}, "body[B3]": 5})
+    del table.cell_values["body[A0]"]
+    project.apply_formulas()
+    assert table.cell_values["body[C0]"] == 18
+
+
 def test_range_formula_relative_refs():
     project = Project()
     table = _make_table(project, "table_1", rows=3, cols=3)
@@ -60,7 +117,7 @@ def test_cross_table_reference():
         "sheet_1",
         table_id="table_2",
         name="table_2",
-        rect=Rect(0, 0, 100, 100),
+        rect=_RECT,
         rows=2,
         cols=2,
         labels=None,
@@ -146,7 +203,7 @@ def test_table_prefixed_column_reference():
         "sheet_1",
         table_id="table_2",
         name="table_2",
-        rect=Rect(0, 0, 100, 100),
+        rect=_RECT,
         rows=2,
         cols=2,
         labels=None,
@@ -168,7 +225,7 @@ def test_table_prefixed_row_reference():
         "sheet_1",
         table_id="table_2",
         name="table_2",
-        rect=Rect(0, 0, 100, 100),
+        rect=_RECT,
         rows=2,
         cols=2,
         labels=None,
@@ -196,3 +253,208 @@ def test_pmt_formula_function():
     project.apply_formulas()
     expected = -(0.1 * (100 * (1 + 0.1) ** 2)) / ((1 + 0.1 * 0) * ((1 + 0.1) ** 2 - 1))
     assert table.cell_values["body[B0]"] == pytest.approx(expected)
+
+
+def test_formulas_apply_in_dependency_order():
+    project = Project()
+    table = _make_table(project, "table_1", rows=3, cols=3)
+    table.set_cells({"body[A0]": 2})
+    table.set_formula("body[C0]", "=B0+B1")
+    table.set_formula("body[B1]", "=B0*10")
+    table.set_formula("body[B0]", "=A0+1")
+    project.apply_formulas()
+    assert table.cell_values["body[C0]"] == 33
+
+    table.set_cells({"body[A0]": 4})
+    project.apply_formulas()
+    assert table.cell_values["body[C0]"] == 55
+
+    table.set_formula("body[A2]", "=A1")
+    table.set_formula("body[A1:A2]", "=7")
+    table.set_formula("body[A1]", "=1")
+    project.apply_formulas()
+    assert table.cell_values["body[A1]"] == 1
+    assert table.cell_values["body[A2]"] == 7
+
+
+def test_filled_formula_recomputes_after_single_cell_edits():
+    project = Project()
+    table = _make_table(project, "table_1", rows=6, cols=4)
+    table.set_range("body[A0:A5]", [[row] for row in range(6)])
+    table.set_cells({"body[D0]": 100})
+    table.set_formula("body[B0:B5]", "=A0*2")
+    table.set_formula("body[C1:C5]", "=B0+B1+$D$0")
+    project.apply_formulas()
+    assert [table.cell_values[f"body[C{row}]"] for row in range(1, 6)] == [102, 106, 110, 114, 118]
+
+    table.set_cells({"body[A2]": 10})
+    project.apply_formulas()
+    assert [table.cell_values[f"body[B{row}]"] for row in range(6)] == [0, 2, 20, 6, 8, 10]
+    assert [table.cell_values[f"body[C{row}]"] for row in range(1, 6)] == [102, 122, 126, 114, 118]
+
+    table.set_cells({"body[D0]": 0})
+    del table.cell_values["body[C5]"]
+    project.apply_formulas()
+    assert [table.cell_values[f"body[C{row}]"] for row in range(1, 6)] == [2, 22, 26, 14, 18]
+
+
+def test_table_apply_formulas_uses_dependency_order():
+    project = Project()
+    table = _make_table(project, "table_1", rows=3, cols=3)
+    table.set_cells({"body[A0]": 2})
+    table.set_formula("body[C0]", "=B0+B1")
+    table.set_formula("body[B1]", "=B0*10")
+    table.set_formula("body[B0]", "=A0+1")
+    assert table.apply_formulas(project)
+    assert table.cell_values["body[C0]"] == 33
+
+
+def test_reapplying_formulas_tracks_edits_between_passes():
+    project = Project()
+    table_1 = _make_table(project, "table_1", rows=3, cols=3)
+    table_1.set_cells({"body[A0]": 1, "body[A2]": 7})
+    table_1.set_formula("body[B0]", "=A0*2")
+    table_1.set_formula("body[B2]", "=A2+1")
+    table_2 = project.add_table(
+        "sheet_1",
+        table_id="table_2",
+        name="table_2",
+        rect=_RECT,
+        rows=2,
+        cols=2,
+        labels=None,
+    )
+    table_2.set_formula("body[A0]", "=table_1.B0+table_1.B2")
+    project.apply_formulas()
+    assert table_2.cell_values["body[A0]"] == 10
+
+    table_1.set_cells({"body[A0]": 4})
+    project.apply_formulas()
+    assert table_1.cell_values["body[B0]"] == 8
+    assert table_1.cell_values["body[B2]"] == 8
+    assert table_2.cell_values["body[A0]"] == 16
+
+    table_1.cell_values["body[B2]"] = 0
+    project.apply_formulas()
+    assert table_1.cell_values["body[B2]"] == 8
+    assert table_2.cell_values["body[A0]"] == 16
+
+
+def test_removing_an_overlapping_formula_restores_the_covered_cells():
+    project = Project()
+    table = _make_table(project, "table_1", rows=4, cols=3)
+    table.set_range("body[A0:A2]", [[1], [2], [3]])
+    table.set_formula("body[B0:B1]", "=A0*10")
+    table.set_formula("body[B1]", "=99")
+    project.apply_formulas()
+    assert table.cell_values["body[B1]"] == 99
+
+    table.set_formula("body[B1]", "")
+    project.apply_formulas()
+    assert table.cell_values["body[B1]"] == 20.0
+
+    table.set_formula("body[B1:B2]", "=99")
+    project.apply_formulas()
+    table.set_cells({"body[B2]": 5})
+    project.apply_formulas()
+    assert table.cell_values["body[B1]"] == 20.0
+    assert table.cell_values["body[B2]"] == 5
+
+
+def test_array_valued_formula_can_be_reapplied():
+    project = Project()
+    table = _make_table(project, "table_1", rows=3, cols=2)
+    table.set_range("body[A0:A2]", [[1], [2], [3]])
+    table.set_formula("body[B0]", "=col(A)")
+    assert table.apply_formulas(project)
+    assert list(table.cell_values["body[B0]"]) == [1, 2, 3]
+    assert table.apply_formulas(project)
+
+
+def test_empty_formula_results_are_exported():
+    project = Project()
+    table = _make_table(project, "table_1", rows=3, cols=2)
+    table.set_formula("body[B0:B1]", "=A0")
+    project.apply_formulas()
+    cell_values = table.to_dict()["cellValues"]
+    assert cell_values["body[B0]"] == {"type": "empty"}
+    assert cell_values["body[B1]"] == {"type": "empty"}
+
+
+def test_column_min_max_skip_nan_after_the_first_value():
+    project = Project()
+    table = _make_table(project, "table_1", rows=3, cols=3)
+    table.set_cells({"body[A0]": 5, "body[A1]": math.nan, "body[A2]": 2, "body[B0]": math.nan, "body[B1]": 1})
+    table.set_formula("body[C0]", "=MIN(col(A))")
+    table.set_formula("body[C1]", "=MAX(col(A))")
+    table.set_formula("body[C2]", "=MIN(col(B))")
+    project.apply_formulas()
+    assert table.cell_values["body[C0]"] == 2.0
+    assert table.cell_values["body[C1]"] == 5.0
+    assert math.isnan(table.cell_values["body[C2]"])
+
+
+def test_min_max_over_large_blocks_skip_nan_after_the_first_value():
+    block = [[1.0, math.nan]] * 40
+    assert cs_min(block) == 1.0
+    assert cs_max([[2.0, math.nan], [3.0, 1.0]] * 20) == 3.0
+    assert math.isnan(cs_min([[math.nan, 1.0]] * 40))
+
+
+def test_large_range_min_max_skip_nan_after_the_first_value():
+    project = Project()
+    table = _make_table(project, "table_1", rows=100, cols=3)
+    table.set_range("body[A0:A99]", [[row + 1] for row in range(100)])
+    table.set_formula("body[A50]", "=AVERAGE(C0:C1)")
+    table.set_formula("body[B0]", "=MIN(A0:A99)")
+    table.set_formula("body[B1]", "=MAX(A0:A99)")
+    table.set_formula("body[B2]", "=MIN(A50:A99)")
+    project.apply_formulas()
+    assert table.cell_values["body[B0]"] == 1.0
+    assert table.cell_values["body[B1]"] == 100.0
+    assert math.isnan(table.cell_values["body[B2]"])
+
+
+def test_large_range_reductions_follow_cell_edits():
+    project = Project()
+    table = _make_table(project, "table_1", rows=100, cols=3)
+    table.set_range("body[A0:A99]", [[row] for row in range(100)])
+    table.set_formula("body[B0]", "=SUM(A0:A99)")
+    table.set_formula("body[B1]", "=COUNT(A0:A99)")
+    table.set_formula("body[B2]", "=MAX(A0:A99)")
+    project.apply_formulas()
+    assert table.cell_values["body[B0]"] == 4950
+    assert table.cell_values["body[B1]"] == 100
+    assert table.cell_values["body[B2]"] == 99
+
+    table.set_cells({"body[A10]": "250", "body[A20]": None})
+    table.set_range("body[A30:A31]", [[""], [1000]])
+    project.apply_formulas()
+    assert table.cell_values["body[B0]"] == 4950 + 240 - 20 - 30 + 969
+    assert table.cell_values["body[B1]"] == 98
+    assert table.cell_values["body[B2]"] == 1000
+
+    table.set_cells({"body[A40]": "n/a"})
+    project.apply_formulas()
+    assert table.cell_values["body[B0]"] == 4950 + 240 - 20 - 30 + 969 - 40
+    assert table.cell_values["body[B1]"] == 97
+
+
+def test_large_arithmetic_fill_matches_cell_by_cell_evaluation():
+    project = Project()
+    table = _make_table(project, "table_1", rows=100, cols=4)
+    table.set_range("body[A0:A99]", [[row] for row in range(100)])
+    table.set_cells({"body[A3]": "n/a", "body[A4]": "8", "body[A5]": None, "body[B0]": 4})
+    table.set_formula("body[C0:C99]", "=A0/(A0-2)*$B$0+1")
+    project.apply_formulas()
+    assert table.cell_values["body[C1]"] == -3.0
+    assert table.cell_values["body[C2]"] == "#ERROR"
+    assert table.cell_values["body[C3]"] == "#ERROR"
+    assert table.cell_values["body[C4]"] == 6.333333333333333
+    assert table.cell_values["body[C5]"] == 1.0
+    assert table.cell_values["body[C99]"] == 99 / 97 * 4 + 1
+
+    table.set_formula("body[D4:D99]", "=D3+A4")
+    table.set_cells({"body[D3]": 1})
+    project.apply_formulas()
+    assert table.cell_values["body[D99]"] == 1 + 8 + sum(range(6, 100))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+_PRELUDE = """
+import json
+import sys
+sys._nummern_numpy_loading = True
+import numpy
+assert not hasattr(numpy, "__version__")
+from canvassheets_api import Project, Rect
+project = Project()
+project.add_sheet("Sheet 1", sheet_id="sheet_1")
+"""
+
+
+def _run_with_shim(source: str):
+    result = subprocess.run(
+        [sys.executable, "-c", _PRELUDE + source],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_shim_large_range_reductions():
+    result = _run_with_shim("""
+table = project.add_table("sheet_1", table_id="table_1", name="table_1",
+                          rect=Rect(0, 0, 100, 100), rows=100, cols=3, labels=None)
+table.set_range("body[A0:A99]", [[index] for index in range(100)])
+table.set_cells({"body[B0]": "x"})
+for row, name in enumerate(["SUM", "AVERAGE", "MIN", "MAX", "COUNT", "COUNTA"]):
+    table.set_formula(f"body[C{row}]", f"={name}(A0:B99)")
+project.apply_formulas()
+print(json.dumps([table.cell_values[f"body[C{row}]"] for row in range(6)]))
+""")
+    assert result == [4950.0, 49.5, 0.0, 99.0, 100, 101]
+
+
+def test_shim_summary_aggregations():
+    result = _run_with_shim("""
+table = project.add_table("sheet_1", table_id="table_1", name="table_1", rows=4, cols=2)
+table.set_range("body[A0:B3]", [["a", 1], ["a", 2.5], ["b", "n/a"], ["b", 4]])
+project.add_summary_table(
+    "sheet_1",
+    table_id="summary_1",
+    name="summary_1",
+    source_table_id="table_1",
+    group_by=["A"],
+    values=[{"col": "B", "agg": agg} for agg in ("sum", "avg", "count")],
+)
+project.apply_formulas()
+summary = project.table("summary_1")
+print(json.dumps([[summary.cell_values.get(f"body[{col}{row}]") for col in "ABCD"] for row in range(2)]))
+""")
+    assert result == [["a", 3.5, 1.75, 2], ["b", 4.0, 4.0, 2]]
+
+
+def test_shim_large_arithmetic_fill():
+    result = _run_with_shim("""
+table = project.add_table("sheet_1", table_id="table_1", name="table_1", rows=100, cols=2)
+table.set_range("body[A0:A99]", [[index] for index in range(100)])
+table.set_formula("body[B0:B99]", "=A0*2+1")
+project.apply_formulas()
+print(json.dumps([table.cell_values["body[B0]"], table.cell_values["body[B99]"]]))
+""")
+    assert result == [1.0, 199.0]
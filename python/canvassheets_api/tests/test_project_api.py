@@ -65,6 +65,21 @@ def test_rect_updates_after_resize_and_labels():
     assert table.rect.width == 6 * _DEFAULT_CELL_WIDTH
 
 
+def test_tables_do_not_share_a_passed_rect():
+    project = Project()
+    project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    rect = Rect(0, 0, 100, 100)
+    table_1 = project.add_table("sheet_1", table_id="table_1", name="table_1", rect=rect, rows=2, cols=2)
+    table_2 = project.add_table("sheet_1", table_id="table_2", name="table_2", rect=rect, rows=2, cols=2)
+
+    before = Rect(table_2.rect.x, table_2.rect.y, table_2.rect.width, table_2.rect.height)
+    table_1.resize(rows=5, cols=5)
+
+    assert table_1.rect != before
+    assert table_2.rect == before
+    assert rect == Rect(0, 0, 100, 100)
+
+
 def test_set_position_updates_origin():
     project = Project()
     project.add_sheet("Sheet 1", sheet_id="sheet_1")
@@ -284,6 +299,60 @@ def test_set_cells_clears_overlapping_formula_range():
     assert table.cell_values["body[B0]"] == 9
 
 
+def test_set_cells_clears_formulas_edited_in_place():
+    project = Project()
+    project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    table = project.add_table(
+        "sheet_1",
+        table_id="table_1",
+        name="table_1",
+        rows=2,
+        cols=2,
+        labels=dict(top=0, left=0, bottom=0, right=0),
+        x=0,
+        y=0,
+    )
+
+    table.set_formula("body[A0]", "=1")
+    table.set_cells({"body[B1]": 1})
+    table.formulas["body[b1]"] = {"formula": "=2", "mode": "spreadsheet"}
+    del table.formulas["body[A0]"]
+    table.set_formula("body[A0]", "=3")
+    table.set_cells({"body[A0]": 4, "body[B1]": 5})
+    assert table.formulas == {}
+
+    table.formulas = {"body[A1:B1]": {"formula": "=6", "mode": "spreadsheet"}}
+    table.set_cells({"body[A0]": 7})
+    assert list(table.formulas) == ["body[A1:B1]"]
+    table.set_cells({"body[B1]": 8})
+    assert table.formulas == {}
+
+
+def test_set_cells_clears_range_formulas_far_down_the_table():
+    project = Project()
+    project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    table = project.add_table(
+        "sheet_1",
+        table_id="table_1",
+        name="table_1",
+        rows=2,
+        cols=2,
+        labels=dict(top=0, left=0, bottom=0, right=0),
+        x=0,
+        y=0,
+    )
+
+    table.set_formula("body[B0:B9999]", "=A0")
+    table.set_formula("body[C500:D520]", "=1")
+    table.set_formula("body[C700:C700]", "=2")
+    table.set_cells({"body[A600]": 1})
+    assert list(table.formulas) == ["body[B0:B9999]", "body[C500:D520]", "body[C700:C700]"]
+    table.set_cells({"body[D520]": 3, "body[C700]": 4})
+    assert list(table.formulas) == ["body[B0:B9999]"]
+    table.set_range("body[B9000:B9001]", [[5], [6]])
+    assert table.formulas == {}
+
+
 def test_set_range_normalizes_ragged_rows():
     project = Project()
     project.add_sheet("Sheet 1", sheet_id="sheet_1")
@@ -307,6 +376,27 @@ def test_set_range_normalizes_ragged_rows():
     assert table.cell_values["body[B1]"] == 3
 
 
+def test_range_values_serialization_tracks_replaced_ranges():
+    project = Project()
+    project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    table = project.add_table("sheet_1", table_id="table_1", name="table_1", rows=2, cols=2)
+
+    table.set_range("body[A0:B1]", [[1, 2], [3, 4]])
+    first = project.to_dict()["sheets"][0]["tables"][0]["rangeValues"]
+    first["body[A0:B1]"]["values"][0][0] = "mutated"
+
+    table.set_range("body[A0:A1]", [[5], [6]])
+    data = project.to_dict()["sheets"][0]["tables"][0]["rangeValues"]
+    assert data["body[A0:B1]"]["values"][0][0] == {"type": "number", "value": 1}
+    assert data["body[A0:A1]"]["values"] == [
+        [{"type": "number", "value": 5}],
+        [{"type": "number", "value": 6}],
+    ]
+
+    table.clear_range("body[A0:B1]")
+    assert list(project.to_dict()["sheets"][0]["tables"][0]["rangeValues"]) == ["body[A0:A1]"]
+
+
 def test_duplicate_ids_rejected():
     project = Project()
     project.add_sheet("Sheet 1", sheet_id="sheet_1")
@@ -336,6 +426,42 @@ def test_duplicate_ids_rejected():
                           y=10)
 
 
+def test_id_lookups_follow_direct_list_edits():
+    project = Project()
+    sheet = project.add_sheet("Sheet 1", sheet_id="sheet_1")
+    table = project.add_table("sheet_1", table_id="table_1", name="table_1", rows=1, cols=1, x=0, y=0)
+    assert project.table("table_1") is table
+
+    sheet.tables.remove(table)
+    with pytest.raises(KeyError):
+        project.table("table_1")
+    assert project.add_table("sheet_1", table_id="table_1", name="again", rows=1, cols=1).name == "again"
+
+    moved = project.add_sheet("Sheet 2", sheet_id="sheet_2")
+    moved.tables.append(table)
+    table.id = "table_2"
+    moved.tables.append(project.add_table("sheet_1", table_id="table_3", name="table_3", rows=1, cols=1))
+    assert project.table("table_2") is table
+    with pytest.raises(ValueError):
+        project.add_table("sheet_2", table_id="table_2", name="other", rows=1, cols=1)
+
+    project.sheets = [moved]
+    assert project._find_sheet("sheet_1") is None
+    assert project.table("table_3").name == "table_3"
+
+    other = Project()
+    other.add_sheet("Other", sheet_id="other")
+    replacement = other.add_table("other", table_id="table_4", name="table_4", rows=1, cols=1)
+    moved.tables[moved.tables.index(table)] = replacement
+    assert project.table("table_4") is replacement
+    with pytest.raises(KeyError):
+        project.table("table_2")
+
+    replacement.id = "table_5"
+    assert project.table("table_5") is replacement
+    assert not project._table_exists("table_4")
+
+
 def test_unsupported_formula_mode_raises():
     project = Project()
     project.add_sheet("Sheet 1", sheet_id="sheet_1")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import json
+import math
+
+from canvassheets_api.runner import _write_project_json, run_script
+
+
+def test_project_json_keeps_non_finite_values(tmp_path, capsysbinary):
+    script = tmp_path / "script.py"
+    script.write_text(
+        "from canvassheets_api import Project\n"
+        "proj = Project()\n"
+        "proj.add_sheet('Sheet 1', sheet_id='sheet_1')\n"
+        "table = proj.add_table('sheet_1', table_id='table_1', name='table_1', rows=3, cols=1)\n"
+        "table.set_cells({'body[A0]': float('nan'), 'body[A1]': float('inf'), 'body[A2]': None})\n",
+        encoding="utf-8",
+    )
+    _write_project_json(run_script(str(script)))
+    cells = json.loads(capsysbinary.readouterr().out)["sheets"][0]["tables"][0]["cellValues"]
+    assert math.isnan(cells["body[A0]"]["value"])
+    assert cells["body[A1]"]["value"] == math.inf
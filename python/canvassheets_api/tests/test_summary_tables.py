@@ -53,3 +53,32 @@ def test_summary_updates_on_change():
     proj.apply_formulas()
     summary = proj.table("summary_1")
     assert summary.cell_values[address("body", 0, 1)] == 11
+
+
+def test_summary_aggregations_follow_source_edits():
+    proj = _make_project()
+    proj.table("table_1").set_cells({address("body", 2, 1): "n/a"})
+    proj.add_summary_table(
+        "sheet_1",
+        table_id="summary_1",
+        name="summary_1",
+        source_table_id="table_1",
+        group_by=["A"],
+        values=[
+            {"col": "B", "agg": "count"},
+            {"col": "B", "agg": "avg"},
+            {"col": "B", "agg": "min"},
+            {"col": "B", "agg": "max"},
+        ],
+    )
+    proj.apply_formulas()
+    summary = proj.table("summary_1")
+    assert [summary.cell_values.get(address("body", 0, col)) for col in range(5)] == ["Group 1", 2, 1.5, 1, 2]
+    assert [summary.cell_values.get(address("body", 1, col)) for col in range(5)] == ["Group 2", 1, None, None, None]
+
+    proj.apply_formulas()
+    proj.table("table_1").set_cells({address("body", 2, 0): "Group 1", address("body", 2, 1): -4})
+    proj.apply_formulas()
+    summary = proj.table("summary_1")
+    assert summary.grid_spec.bodyRows == 1
+    assert [summary.cell_values.get(address("body", 0, col)) for col in range(5)] == ["Group 1", 3, -1 / 3, -4, 2]
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import importlib
-import math
 import sys
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Callable, Iterable, List, Optional, Sequence
 
@@ -45,22 +45,21 @@ if not _try_load_real_numpy():
     class ndarray:
         def __init__(self, data: Any):
             self._data = data
+            self._items = data if isinstance(data, list) else [data]
 
         @property
         def flat(self) -> Iterable[Any]:
-            return _flatten(self._data)
+            return iter(_flatten(self._data))
 
         @property
         def size(self) -> int:
-            return sum(1 for _ in _flatten(self._data))
+            return len(_flatten(self._data))
 
         def tolist(self) -> Any:
             return self._data
 
         def __iter__(self):
-            if isinstance(self._data, list):
-                return iter(self._data)
-            return iter([self._data])
+            return iter(self._items)
 
     class number:
         pass
@@ -72,8 +71,9 @@ if not _try_load_real_numpy():
         if isinstance(values, ndarray):
             return values
         if isinstance(values, (list, tuple)):
-            data = [_copy_nested(value) for value in values]
-            return ndarray(data)
+            if not any(issubclass(kind, (list, tuple)) for kind in set(map(type, values))):
+                return ndarray(list(values))
+            return ndarray(_copy_nested(values))
         return ndarray(values)
 
     def vectorize(func: Callable[..., Any], otypes: Optional[Sequence[Any]] = None) -> Callable[..., ndarray]:
@@ -89,66 +89,85 @@ if not _try_load_real_numpy():
         return ndarray(_select_nested(cond_data, x_data, y_data))
 
     def nansum(values: Any, axis: Optional[int] = None) -> Any:
-        data = values._data if isinstance(values, ndarray) else values
-        if axis is None:
-            return sum(_iter_numbers(data))
-        if axis == 0:
-            rows = data or []
-            columns = list(zip(*rows)) if rows else []
-            return [nansum(list(column)) for column in columns]
-        if axis == 1:
-            return [nansum(row) for row in data]
-        raise ValueError("Unsupported axis")
+        reduce = _NANSUM_AXES.get(axis, _unsupported_axis)
+        return reduce(values._data if isinstance(values, ndarray) else values)
 
     def nanmean(values: Any, axis: Optional[int] = None) -> Any:
-        data = values._data if isinstance(values, ndarray) else values
-        if axis is None:
-            numbers = list(_iter_numbers(data))
-            if not numbers:
-                return nan
-            return sum(numbers) / len(numbers)
-        if axis == 0:
-            rows = data or []
-            columns = list(zip(*rows)) if rows else []
-            return [nanmean(list(column)) for column in columns]
-        if axis == 1:
-            return [nanmean(row) for row in data]
+        reduce = _NANMEAN_AXES.get(axis, _unsupported_axis)
+        return reduce(values._data if isinstance(values, ndarray) else values)
+
+    def _nansum_flat(data: Any) -> float:
+        return sum(_nan_floats(data))
+
+    def _nansum_columns(data: Any) -> List[float]:
+        return _reduce_columns(data, _nansum_flat)
+
+    def _nansum_rows(data: Any) -> List[float]:
+        return [sum(_nan_floats(row)) for row in data]
+
+    def _nanmean_flat(data: Any) -> float:
+        numbers = _nan_floats(data)
+        if not numbers:
+            return nan
+        return sum(numbers) / len(numbers)
+
+    def _nanmean_columns(data: Any) -> List[float]:
+        return _reduce_columns(data, _nanmean_flat)
+
+    def _nanmean_rows(data: Any) -> List[float]:
+        return [_nanmean_flat(row) for row in data]
+
+    def _unsupported_axis(data: Any) -> Any:
         raise ValueError("Unsupported axis")
 
-    def _iter_numbers(values: Any) -> Iterable[float]:
-        for item in _flatten(values):
-            if item is None:
-                continue
-            if isinstance(item, float) and math.isnan(item):
-                continue
-            if isinstance(item, bool):
-                yield float(int(item))
-            elif isinstance(item, (int, float)):
-                yield float(item)
-
-    def _flatten(values: Any) -> Iterable[Any]:
-        if isinstance(values, ndarray):
-            values = values._data
-        if isinstance(values, list):
-            for item in values:
-                yield from _flatten(item)
-        else:
-            yield values
+    _NANSUM_AXES = {None: _nansum_flat, 0: _nansum_columns, 1: _nansum_rows}
+    _NANMEAN_AXES = {None: _nanmean_flat, 0: _nanmean_columns, 1: _nanmean_rows}
 
-    def _copy_nested(values: Any) -> Any:
-        if isinstance(values, list):
-            return [_copy_nested(value) for value in values]
-        if isinstance(values, tuple):
-            return [_copy_nested(value) for value in values]
+    def _reduce_columns(data: Any, reduce: Callable[[List[Any]], Any]) -> List[Any]:
+        return [reduce(list(column)) for column in zip(*(data or []))]
+
+    def _nan_floats(values: Any, _float: type = float, _isinstance: Callable[..., bool] = isinstance,
+                    _number: tuple = (int, float)) -> List[float]:
+        return [_float(item) for item in _flatten(values) if _isinstance(item, _number) and item == item]
+
+    def _flatten(values: Any, _isinstance: Callable[..., bool] = isinstance) -> List[Any]:
+        data = values._data if isinstance(values, ndarray) else values
+        if isinstance(data, list) and not any(issubclass(kind, (list, ndarray)) for kind in set(map(type, data))):
+            return list(data)
+        flattened: List[Any] = []
+        stack = [values]
+        pop, extend, append = stack.pop, stack.extend, flattened.append
+        while stack:
+            item = pop()
+            if _isinstance(item, ndarray):
+                item = item._data
+            if _isinstance(item, list):
+                extend(reversed(item))
+            else:
+                append(item)
+        return flattened
+
+    def _copy_nested(values: Any, _isinstance: Callable[..., bool] = isinstance,
+                     _sequence: tuple = (list, tuple)) -> Any:
+        if _isinstance(values, _sequence):
+            return [_copy_nested(value) if _isinstance(value, _sequence) else value for value in values]
         return values
 
     def _map_nested(values: Any, func: Callable[[Any], Any]) -> Any:
         if isinstance(values, list):
+            if not any(issubclass(kind, list) for kind in set(map(type, values))):
+                return list(map(func, values))
             return [_map_nested(value, func) for value in values]
         return func(values)
 
     def _select_nested(condition: Any, x: Any, y: Any) -> Any:
         if isinstance(condition, list):
+            if not any(issubclass(kind, list) for kind in set(map(type, condition))):
+                x_items = _broadcast_branch(x, len(condition))
+                y_items = _broadcast_branch(y, len(condition))
+                if x_items is not None and y_items is not None:
+                    return [x_item if item else y_item
+                            for item, x_item, y_item in zip(condition, x_items, y_items)]
             result = []
             for index, item in enumerate(condition):
                 x_item = x[index] if isinstance(x, list) else x
@@ -157,6 +176,13 @@ if not _try_load_real_numpy():
             return result
         return x if condition else y
 
+    def _broadcast_branch(values: Any, length: int) -> Optional[Iterable[Any]]:
+        if not isinstance(values, list):
+            return repeat(values)
+        if type(values) is list and len(values) >= length:
+            return values
+        return None
+
     __all__ = [
         "array",
         "bool_",